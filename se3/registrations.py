@@ -0,0 +1,352 @@
+"""
+Short Exercises #3 - Support code for querying voter registration data
+"""
+
+import bisect
+import concurrent.futures
+import copy
+import heapq
+import os
+
+import test_helpers
+
+
+def stream_num_of_new_voters(registered_voters, target):
+    """
+    Generate the (state, year, month) of each row, in order, that had at
+    least target number of voters register during that month.
+
+    Args:
+        registered_voters (iterable of dicts): newly registered voters,
+            e.g. straight from csv.DictReader
+        target (int): target number of new voters
+
+    Returns (generator of tuples): Entries that meet the target number of
+        new voters, in tuple form
+    """
+
+    for row in registered_voters:
+        if int(row["New registered voters"]) >= target:
+            yield (row["Jurisdiction"], row["Year"], row["Month"])
+
+
+def stream_total_registered_voters(registered_voters, month_and_year):
+    """
+    Map each state to how many voters registered in a given month and
+    year, consuming the rows one at a time.
+
+    Args:
+        registered_voters (iterable of dicts): newly registered voters
+        month_and_year (tuple): a month and year
+
+    Returns (dict): A dictionary that maps states (strings) to new
+        voters (strings)
+    """
+
+    month, year = month_and_year
+    totals = {}
+    for row in registered_voters:
+        if row["Month"] == month and row["Year"] == year:
+            totals[row["Jurisdiction"]] = row["New registered voters"]
+    return totals
+
+
+def stream_new_voters_by_month(registered_voters, year):
+    """
+    Map each month to a list of the number of new voters registered in
+    that month in a given year, consuming the rows one at a time.
+
+    Args:
+        registered_voters (iterable of dicts): newly registered voters
+        year (string): a year
+
+    Returns (dict): A dictionary that maps months (strings) to a list of
+        new voters (list of strings)
+    """
+
+    by_month = {}
+    for row in registered_voters:
+        if row["Year"] == year:
+            by_month.setdefault(row["Month"], []).append(
+                row["New registered voters"])
+    return by_month
+
+
+def answer_queries(registered_voters, queries):
+    """
+    Answer a batch of queries in a single pass over the rows.  Each query
+    is a pair with the name of one of the se3 functions
+    (num_of_new_voters, total_registered_voters, or new_voters_by_month)
+    and the second argument that would be passed to that function.
+
+    For example:
+        answer_queries(voters, [("num_of_new_voters", 150000),
+                                ("total_registered_voters", ("Jan", "2020")),
+                                ("new_voters_by_month", "2016")])
+
+    Args:
+        registered_voters (iterable of dicts): newly registered voters
+        queries (list of tuples): (function name, argument) pairs
+
+    Returns (list): the answer to each query, in the same order as queries
+    """
+
+    results = []
+    by_target = {}
+    by_month_and_year = {}
+    by_year = {}
+    for name, arg in queries:
+        if name == "num_of_new_voters":
+            result = by_target.setdefault(arg, [])
+        elif name == "total_registered_voters":
+            result = by_month_and_year.setdefault(tuple(arg), {})
+        elif name == "new_voters_by_month":
+            result = by_year.setdefault(arg, {})
+        else:
+            raise ValueError(f"Unknown query: {name}")
+        results.append(result)
+
+    targets = sorted(by_target)
+    for row in registered_voters:
+        state = row["Jurisdiction"]
+        year = row["Year"]
+        month = row["Month"]
+        count = row["New registered voters"]
+
+        # Every target less than or equal to count is met by this row
+        num_met = bisect.bisect_right(targets, int(count))
+        if num_met > 0:
+            entry = (state, year, month)
+            for target in targets[:num_met]:
+                by_target[target].append(entry)
+
+        totals = by_month_and_year.get((month, year))
+        if totals is not None:
+            totals[state] = count
+
+        by_month = by_year.get(year)
+        if by_month is not None:
+            by_month.setdefault(month, []).append(count)
+
+    # Repeated queries share a result, so give each repeat its own copy
+    answers = []
+    seen = set()
+    for result in results:
+        answers.append(copy.deepcopy(result) if id(result) in seen else result)
+        seen.add(id(result))
+    return answers
+
+
+def _answer_chunk(filename, start, end, queries):
+    """
+    Answer queries over one byte range of a CSV file (runs in a worker).
+    """
+
+    rows = test_helpers.iter_csv_chunk(filename, start, end)
+    return answer_queries(rows, queries)
+
+
+def _merge_answer(name, total, partial):
+    """
+    Fold the partial answer to a query from a later chunk into the
+    answer from the earlier chunks.
+    """
+
+    if name == "num_of_new_voters":
+        total.extend(partial)
+    elif name == "total_registered_voters":
+        total.update(partial)
+    else:
+        for month, counts in partial.items():
+            total.setdefault(month, []).extend(counts)
+
+
+def parallel_answer_queries(filename, queries, num_workers=None):
+    """
+    Answer a batch of queries (see answer_queries) over a CSV file by
+    splitting it into chunks that are parsed and aggregated in a pool
+    of processes.  The partial answers are merged in file order, so the
+    result is the same as answer_queries on the whole file.
+
+    Args:
+        filename (string): the name of the CSV file
+        queries (list of tuples): (function name, argument) pairs
+        num_workers (int): number of processes (defaults to the number
+            of CPUs)
+
+    Returns (list): the answer to each query, in the same order as queries
+    """
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    chunks = test_helpers.split_csv_file(filename, num_workers)
+    if not chunks:
+        return answer_queries([], queries)
+
+    with concurrent.futures.ProcessPoolExecutor(num_workers) as pool:
+        futures = [pool.submit(_answer_chunk, filename, start, end, queries)
+                   for start, end in chunks]
+        answers = futures[0].result()
+        for future in futures[1:]:
+            for (name, _), total, partial in zip(queries, answers,
+                                                 future.result()):
+                _merge_answer(name, total, partial)
+    return answers
+
+
+def top_months(registered_voters, k):
+    """
+    Find the k entries with the most newly registered voters, using a
+    heap of size k rather than sorting all of the rows.
+
+    Args:
+        registered_voters (iterable of dicts): newly registered voters
+        k (int): the number of entries to find
+
+    Returns (list of tuples): (state, year, month) of the k largest
+        entries, largest first (ties in the order of the rows)
+    """
+
+    largest = heapq.nlargest(
+        k, registered_voters, key=lambda row: int(row["New registered voters"]))
+    return [(row["Jurisdiction"], row["Year"], row["Month"]) for row in largest]
+
+
+class CountIndex:
+    """
+    Rows of newly registered voters sorted by count, so threshold queries
+    (as in num_of_new_voters) are a binary search plus a slice.
+
+    Attributes:
+        entries (list of tuples): (state, year, month) of each row, in
+            the order of the rows
+        order (list of ints): positions of the rows, sorted by count
+        sorted_counts (list of ints): the counts, in the same order
+    """
+
+    def __init__(self, registered_voters):
+        """
+        Build the index.
+
+        Args:
+            registered_voters (iterable of dicts): newly registered voters
+        """
+
+        self.entries = []
+        counts = []
+        for row in registered_voters:
+            self.entries.append((row["Jurisdiction"], row["Year"], row["Month"]))
+            counts.append(int(row["New registered voters"]))
+
+        # Break ties so that earlier rows come last, which makes top_k
+        # agree with top_months
+        self.order = sorted(range(len(counts)), key=lambda i: (counts[i], -i))
+        self.sorted_counts = [counts[i] for i in self.order]
+
+    def num_of_new_voters(self, target):
+        """
+        Find the (state, year, month) that had at least target number of
+        voters register.
+
+        Args:
+            target (int): target number of new voters
+
+        Returns (list of tuples): matching entries, in the order of the rows
+        """
+
+        start = bisect.bisect_left(self.sorted_counts, target)
+        return [self.entries[i] for i in sorted(self.order[start:])]
+
+    def top_k(self, k):
+        """
+        Find the k entries with the most newly registered voters.
+
+        Args:
+            k (int): the number of entries to find
+
+        Returns (list of tuples): (state, year, month) of the k largest
+            entries, largest first
+        """
+
+        if k <= 0:
+            return []
+        return [self.entries[i] for i in reversed(self.order[-k:])]
+
+
+class VoterIndex:
+    """
+    Index over newly registered voters that answers the same questions as
+    total_registered_voters and new_voters_by_month without scanning the
+    whole dataset per query.
+
+    The index can be kept up to date as new data arrives: update absorbs
+    new rows, and a row for a (state, year, month) that is already in the
+    index replaces the earlier count (in its original position).
+
+    Attributes:
+        by_month_and_year (dict): maps (month, year) to a dictionary that
+            maps states to new voters
+        by_year (dict): maps a year to a dictionary that maps months to
+            the same state dictionaries stored in by_month_and_year
+    """
+
+    def __init__(self, registered_voters=()):
+        """
+        Build the index.
+
+        Args:
+            registered_voters (iterable of dicts): newly registered voters
+        """
+
+        self.by_month_and_year = {}
+        self.by_year = {}
+        self.update(registered_voters)
+
+    def update(self, registered_voters):
+        """
+        Add new or corrected rows to the index.  Takes time proportional
+        to the number of rows, not the size of the index.
+
+        Args:
+            registered_voters (iterable of dicts): newly registered voters
+        """
+
+        for row in registered_voters:
+            year = row["Year"]
+            month = row["Month"]
+
+            states = self.by_month_and_year.get((month, year))
+            if states is None:
+                states = {}
+                self.by_month_and_year[(month, year)] = states
+                self.by_year.setdefault(year, {})[month] = states
+            states[row["Jurisdiction"]] = row["New registered voters"]
+
+    def total_registered_voters(self, month_and_year):
+        """
+        Map each state to how many voters registered in a given month
+        and year.
+
+        Args:
+            month_and_year (tuple): a month and year
+
+        Returns (dict): A dictionary that maps states (strings) to new
+            voters (strings)
+        """
+
+        return dict(self.by_month_and_year.get(tuple(month_and_year), {}))
+
+    def new_voters_by_month(self, year):
+        """
+        Map each month to a list of the number of new voters registered
+        in that month in a given year.
+
+        Args:
+            year (string): a year
+
+        Returns (dict): A dictionary that maps months (strings) to a list
+            of new voters (list of strings)
+        """
+
+        months = self.by_year.get(year, {})
+        return {month: list(states.values()) for month, states in months.items()}
@@ -1,26 +1,292 @@
+import array
 import csv
+import hashlib
 import json
+import mmap
 import os
+import pickle
+import struct
 import sys
 
-def read_CSV_file(filename):
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+FIELDS = ("Jurisdiction", "Year", "Month", "New registered voters")
+
+# Header of a columns file: magic number, number of rows, and the
+# size in bytes of the state name table
+COLUMNS_MAGIC = b"VOTERCOL"
+COLUMNS_HEADER = struct.Struct("<8sQQ")
+
+def _file_signature(filename):
+    '''
+    Compute the size, modification time, and SHA-256 hash of a file.
+    '''
+
+    stat = os.stat(filename)
+    with open(filename, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return (stat.st_size, stat.st_mtime_ns, digest)
+
+
+def read_CSV_file(filename, use_cache=False):
     '''
     Load the data from a CSV file.
 
+    When use_cache is True, the parsed rows are saved in a pickle file
+    next to the CSV file (filename + ".cache") and later calls load them
+    from there, as long as the size, modification time, and hash of the
+    CSV file are unchanged.
+
     Inputs:
       filename (string): the name of the file
+      use_cache (boolean): use (and refresh) the cache file
 
     Returns: list
     '''
 
+    try:
+        if not use_cache:
+            with open(filename) as f:
+                return [row for row in csv.DictReader(f)]
+        signature = _file_signature(filename)
+    except FileNotFoundError:
+        msg = ("Cannot open file: {}.")
+        assert False, msg.format(filename)
+
+    cache_filename = filename + ".cache"
+    try:
+        with open(cache_filename, "rb") as f:
+            cached_signature, rows = pickle.load(f)
+        if cached_signature == signature:
+            return rows
+    except Exception: #pylint: disable=broad-except
+        # Missing or unreadable cache: fall back to parsing the CSV file
+        pass
+
+    rows = read_CSV_file(filename)
+    try:
+        with open(cache_filename, "wb") as f:
+            pickle.dump((signature, rows), f, pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return rows
+
+
+def iter_csv_file(filename):
+    '''
+    Generate the rows of a CSV file one at a time, without loading the
+    whole file into memory.
+
+    Inputs:
+      filename (string): the name of the file
+
+    Returns: generator of dicts
+    '''
+
     try:
         with open(filename) as f:
-            return [row for row in csv.DictReader(f)]
+            yield from csv.DictReader(f)
     except FileNotFoundError:
         msg = ("Cannot open file: {}.")
         assert False, msg.format(filename)
 
 
+def split_csv_file(filename, num_chunks):
+    '''
+    Split the body of a CSV file (everything after the header) into
+    byte ranges that start and end on line boundaries.  Assumes that
+    no field contains an embedded newline.
+
+    Inputs:
+      filename (string): the name of the file
+      num_chunks (int): the desired number of chunks
+
+    Returns: list of (start, end) byte offsets, in file order
+    '''
+
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        body_start = len(f.readline())
+        starts = [body_start]
+        for i in range(1, num_chunks):
+            pos = body_start + i * (size - body_start) // num_chunks
+            # Back up one byte so a pos at the start of a line is kept
+            f.seek(pos - 1)
+            f.readline()
+            if f.tell() > starts[-1]:
+                starts.append(f.tell())
+
+    ends = starts[1:] + [size]
+    return [(start, end) for start, end in zip(starts, ends) if start < end]
+
+
+def iter_csv_chunk(filename, start, end):
+    '''
+    Generate the rows of a CSV file that fall in the byte range produced
+    by split_csv_file.  The field names come from the header of the file.
+
+    Inputs:
+      filename (string): the name of the file
+      start (int): the offset of the first line in the chunk
+      end (int): the offset just past the last line in the chunk
+
+    Returns: generator of dicts
+    '''
+
+    with open(filename, "rb") as f:
+        fieldnames = next(csv.reader([f.readline().decode("utf-8")]))
+        f.seek(start)
+
+        def lines():
+            while f.tell() < end:
+                yield f.readline().decode("utf-8")
+
+        yield from csv.DictReader(lines(), fieldnames=fieldnames)
+
+
+class VoterColumns:
+    '''
+    Column-oriented, typed version of the voter registration data.
+
+    Each state name is stored once in state_names and the rows refer to
+    it by its position in that list.  Months are stored as 1 (Jan)
+    through 12 (Dec).
+
+    Indexing (or iterating over) an instance produces the same dicts
+    that read_CSV_file returns, so the columns can be passed to the
+    functions in se3 in place of the list of dicts.
+
+    Attributes:
+      state_names (list of strings): the distinct state names
+      states (array of uint16): index into state_names for each row
+      years (array of int16): the year of each row
+      months (array of uint8): the month (1-12) of each row
+      counts (array of int64): the number of new voters in each row
+    '''
+
+    def __init__(self, state_names=None, states=None, years=None,
+                 months=None, counts=None):
+        self.state_names = [] if state_names is None else state_names
+        self.states = array.array("H") if states is None else states
+        self.years = array.array("h") if years is None else years
+        self.months = array.array("B") if months is None else months
+        self.counts = array.array("q") if counts is None else counts
+        self._state_codes = {name: i for i, name in enumerate(self.state_names)}
+
+    def append(self, state, year, month, count):
+        '''
+        Add a row to the columns.
+
+        Inputs:
+          state (string): the jurisdiction
+          year (string or int): the year
+          month (string): the abbreviated month name (e.g. "Jan")
+          count (string or int): the number of new voters
+        '''
+        code = self._state_codes.get(state)
+        if code is None:
+            code = len(self.state_names)
+            self._state_codes[state] = code
+            self.state_names.append(sys.intern(state))
+        self.states.append(code)
+        self.years.append(int(year))
+        self.months.append(MONTHS.index(month) + 1)
+        self.counts.append(int(count))
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, i):
+        return {"Jurisdiction": self.state_names[self.states[i]],
+                "Year": str(self.years[i]),
+                "Month": MONTHS[self.months[i] - 1],
+                "New registered voters": str(self.counts[i])}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def read_csv_columns(filename):
+    '''
+    Load the voter registration data from a CSV file into typed columns.
+
+    Inputs:
+      filename (string): the name of the file
+
+    Returns: VoterColumns
+    '''
+
+    columns = VoterColumns()
+    try:
+        with open(filename) as f:
+            for row in csv.DictReader(f):
+                columns.append(*(row[field] for field in FIELDS))
+    except FileNotFoundError:
+        msg = ("Cannot open file: {}.")
+        assert False, msg.format(filename)
+    return columns
+
+
+def write_columns_file(columns, filename):
+    '''
+    Save voter registration columns in the binary format read by
+    open_columns_file: a header followed by the counts, years, states
+    and months columns (in that order, so each column is aligned) and
+    then the newline-separated state names.
+
+    Inputs:
+      columns (VoterColumns): the data to save
+      filename (string): the name of the file
+    '''
+
+    names = "\n".join(columns.state_names).encode("utf-8")
+    with open(filename, "wb") as f:
+        f.write(COLUMNS_HEADER.pack(COLUMNS_MAGIC, len(columns), len(names)))
+        for column, typecode in ((columns.counts, "q"), (columns.years, "h"),
+                                 (columns.states, "H"), (columns.months, "B")):
+            f.write(array.array(typecode, column).tobytes())
+        f.write(names)
+
+
+def open_columns_file(filename):
+    '''
+    Open a file written by write_columns_file as read-only, memory-mapped
+    columns.  The columns are views of the mapped file, so processes that
+    open the same file share a single copy of the data through the
+    operating system's page cache.
+
+    Inputs:
+      filename (string): the name of the file
+
+    Returns: VoterColumns
+    '''
+
+    try:
+        with open(filename, "rb") as f:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except FileNotFoundError:
+        msg = ("Cannot open file: {}.")
+        assert False, msg.format(filename)
+
+    magic, num_rows, names_size = COLUMNS_HEADER.unpack_from(data)
+    assert magic == COLUMNS_MAGIC, f"Not a columns file: {filename}."
+
+    columns = []
+    offset = COLUMNS_HEADER.size
+    for typecode in ("q", "h", "H", "B"):
+        size = num_rows * struct.calcsize(typecode)
+        columns.append(data[offset:offset + size].cast(typecode))
+        offset += size
+    counts, years, states, months = columns
+
+    names = bytes(data[offset:offset + names_size]).decode("utf-8")
+    state_names = [sys.intern(name) for name in names.split("\n")] \
+        if names_size > 0 else []
+    return VoterColumns(state_names, states, years, months, counts)
+
+
 def read_JSON_file(filename):
     '''
     Load data from a JSON file.
@@ -37,5 +303,3 @@ def read_JSON_file(filename):
     except FileNotFoundError:
         msg = ("Cannot open file: {}.")
         assert False, msg.format(filename)
-
-        
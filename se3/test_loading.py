@@ -0,0 +1,133 @@
+import os
+import pickle
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import test_helpers
+
+FILENAMES = ["tests/new_voter_registrations.csv",
+             "tests/new_voter_registrations_small.csv"]
+
+
+def copy_file(filename, directory):
+    '''
+    Copy a file into a directory (so that tests can change it).
+
+    Returns: (string) the name of the copy
+    '''
+
+    copy = directory / os.path.basename(filename)
+    with open(filename, "rb") as f:
+        copy.write_bytes(f.read())
+    return str(copy)
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_read_csv_columns(filename):
+    rows = test_helpers.read_CSV_file(filename)
+    columns = test_helpers.read_csv_columns(filename)
+
+    assert len(columns) == len(rows)
+    assert list(columns) == rows
+    assert [columns[i] for i in range(len(rows))] == rows
+    assert sorted(columns.state_names) == \
+        sorted({row["Jurisdiction"] for row in rows})
+    assert list(columns.months) == \
+        [test_helpers.MONTHS.index(row["Month"]) + 1 for row in rows]
+    assert list(columns.counts) == \
+        [int(row["New registered voters"]) for row in rows]
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_iter_csv_file(filename):
+    rows = test_helpers.iter_csv_file(filename)
+    assert list(rows) == test_helpers.read_CSV_file(filename)
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+@pytest.mark.parametrize("num_chunks", [1, 2, 3, 7, 1000])
+def test_split_csv_file(filename, num_chunks):
+    chunks = test_helpers.split_csv_file(filename, num_chunks)
+
+    assert 1 <= len(chunks) <= num_chunks
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+    assert chunks[-1][1] == os.path.getsize(filename)
+
+    rows = []
+    for start, end in chunks:
+        rows.extend(test_helpers.iter_csv_chunk(filename, start, end))
+    assert rows == test_helpers.read_CSV_file(filename)
+
+
+def test_read_csv_file_cache(tmp_path):
+    filename = copy_file(FILENAMES[1], tmp_path)
+    rows = test_helpers.read_CSV_file(filename)
+
+    assert test_helpers.read_CSV_file(filename, use_cache=True) == rows
+    assert os.path.exists(filename + ".cache")
+    assert test_helpers.read_CSV_file(filename, use_cache=True) == rows
+
+
+def test_read_csv_file_uses_cache(tmp_path):
+    filename = copy_file(FILENAMES[1], tmp_path)
+    signature = test_helpers._file_signature(filename)
+    with open(filename + ".cache", "wb") as f:
+        pickle.dump((signature, ["cached"]), f)
+
+    assert test_helpers.read_CSV_file(filename, use_cache=True) == ["cached"]
+
+
+def test_read_csv_file_cache_is_refreshed(tmp_path):
+    filename = copy_file(FILENAMES[1], tmp_path)
+    test_helpers.read_CSV_file(filename, use_cache=True)
+
+    with open(filename, "a") as f:
+        f.write("Texas,2020,Apr,12345\n")
+    rows = test_helpers.read_CSV_file(filename, use_cache=True)
+    assert rows == test_helpers.read_CSV_file(filename)
+    assert rows[-1]["New registered voters"] == "12345"
+    assert test_helpers.read_CSV_file(filename, use_cache=True) == rows
+
+
+def test_read_csv_file_bad_cache(tmp_path):
+    filename = copy_file(FILENAMES[1], tmp_path)
+    with open(filename + ".cache", "wb") as f:
+        f.write(b"not a pickle")
+
+    assert test_helpers.read_CSV_file(filename, use_cache=True) == \
+        test_helpers.read_CSV_file(filename)
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_columns_file(filename, tmp_path):
+    columns = test_helpers.read_csv_columns(filename)
+    columns_filename = str(tmp_path / "voters.columns")
+    test_helpers.write_columns_file(columns, columns_filename)
+    mapped = test_helpers.open_columns_file(columns_filename)
+
+    assert mapped.state_names == columns.state_names
+    for name in ("states", "years", "months", "counts"):
+        assert list(getattr(mapped, name)) == list(getattr(columns, name))
+    assert list(mapped) == test_helpers.read_CSV_file(filename)
+
+
+def test_empty_columns_file(tmp_path):
+    columns_filename = str(tmp_path / "empty.columns")
+    test_helpers.write_columns_file(test_helpers.VoterColumns(),
+                                    columns_filename)
+    mapped = test_helpers.open_columns_file(columns_filename)
+
+    assert len(mapped) == 0
+    assert mapped.state_names == []
+    assert list(mapped) == []
+
+
+def test_not_a_columns_file(tmp_path):
+    with pytest.raises(AssertionError):
+        test_helpers.open_columns_file(copy_file(FILENAMES[1], tmp_path))
@@ -0,0 +1,178 @@
+import os
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import registrations
+import test_helpers
+
+FILENAME = "tests/new_voter_registrations.csv"
+voters = test_helpers.read_CSV_file(FILENAME)
+
+YEARS = sorted({row["Year"] for row in voters}) + ["1999"]
+MONTHS_AND_YEARS = [(month, year)
+                    for year in YEARS for month in test_helpers.MONTHS]
+TARGETS = [0, 1, 50000, 100000, 150000, 200000, 10 ** 9]
+
+
+### Reference versions of the se3 functions (a scan over every row)
+
+def reference_num_of_new_voters(rows, target):
+    return [(row["Jurisdiction"], row["Year"], row["Month"])
+            for row in rows if int(row["New registered voters"]) >= target]
+
+
+def reference_total_registered_voters(rows, month_and_year):
+    month, year = month_and_year
+    return {row["Jurisdiction"]: row["New registered voters"]
+            for row in rows if (row["Month"], row["Year"]) == (month, year)}
+
+
+def reference_new_voters_by_month(rows, year):
+    by_month = {}
+    for row in rows:
+        if row["Year"] == year:
+            by_month.setdefault(row["Month"], []).append(
+                row["New registered voters"])
+    return by_month
+
+
+@pytest.mark.parametrize("month_and_year", MONTHS_AND_YEARS)
+def test_voter_index_total_registered_voters(month_and_year):
+    index = registrations.VoterIndex(voters)
+    assert index.total_registered_voters(month_and_year) == \
+        reference_total_registered_voters(voters, month_and_year)
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_voter_index_new_voters_by_month(year):
+    index = registrations.VoterIndex(voters)
+    assert index.new_voters_by_month(year) == \
+        reference_new_voters_by_month(voters, year)
+
+
+def test_voter_index_results_are_copies():
+    index = registrations.VoterIndex(voters)
+    index.total_registered_voters(("Jan", "2020"))["Texas"] = "0"
+    index.new_voters_by_month("2020")["Jan"].append("0")
+
+    assert index.total_registered_voters(("Jan", "2020")) == \
+        reference_total_registered_voters(voters, ("Jan", "2020"))
+    assert index.new_voters_by_month("2020") == \
+        reference_new_voters_by_month(voters, "2020")
+
+
+@pytest.mark.parametrize("target", TARGETS)
+def test_stream_num_of_new_voters(target):
+    rows = test_helpers.iter_csv_file(FILENAME)
+    actual = registrations.stream_num_of_new_voters(rows, target)
+    assert list(actual) == reference_num_of_new_voters(voters, target)
+
+
+@pytest.mark.parametrize("month_and_year", MONTHS_AND_YEARS)
+def test_stream_total_registered_voters(month_and_year):
+    rows = test_helpers.iter_csv_file(FILENAME)
+    assert registrations.stream_total_registered_voters(
+        rows, month_and_year) == \
+        reference_total_registered_voters(voters, month_and_year)
+
+
+@pytest.mark.parametrize("year", YEARS)
+def test_stream_new_voters_by_month(year):
+    rows = test_helpers.iter_csv_file(FILENAME)
+    assert registrations.stream_new_voters_by_month(rows, year) == \
+        reference_new_voters_by_month(voters, year)
+
+
+QUERIES = ([("num_of_new_voters", target) for target in TARGETS]
+           + [("total_registered_voters", month_and_year)
+              for month_and_year in MONTHS_AND_YEARS]
+           + [("new_voters_by_month", year) for year in YEARS]
+           + [("num_of_new_voters", 100000), ("new_voters_by_month", "2020")])
+
+
+def reference_answers(rows, queries):
+    functions = {"num_of_new_voters": reference_num_of_new_voters,
+                 "total_registered_voters": reference_total_registered_voters,
+                 "new_voters_by_month": reference_new_voters_by_month}
+    return [functions[name](rows, arg) for name, arg in queries]
+
+
+def test_answer_queries():
+    answers = registrations.answer_queries(iter(voters), QUERIES)
+    assert answers == reference_answers(voters, QUERIES)
+
+
+def test_answer_queries_repeats_are_copies():
+    first, second = registrations.answer_queries(
+        voters, [("num_of_new_voters", 0)] * 2)
+    first.append(("Nowhere", "2020", "Jan"))
+    assert second == reference_num_of_new_voters(voters, 0)
+
+
+def test_answer_queries_unknown_query():
+    with pytest.raises(ValueError):
+        registrations.answer_queries(voters, [("num_of_voters", 0)])
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 3])
+def test_parallel_answer_queries(num_workers):
+    answers = registrations.parallel_answer_queries(FILENAME, QUERIES,
+                                                    num_workers)
+    assert answers == reference_answers(voters, QUERIES)
+
+
+@pytest.mark.parametrize("target", TARGETS)
+def test_count_index_num_of_new_voters(target):
+    index = registrations.CountIndex(voters)
+    assert index.num_of_new_voters(target) == \
+        reference_num_of_new_voters(voters, target)
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, len(voters), len(voters) + 10])
+def test_top_months(k):
+    largest = sorted(voters, key=lambda row: int(row["New registered voters"]),
+                     reverse=True)[:k]
+    expected = [(row["Jurisdiction"], row["Year"], row["Month"])
+                for row in largest]
+
+    assert registrations.top_months(voters, k) == expected
+    assert registrations.CountIndex(voters).top_k(k) == expected
+
+
+def test_voter_index_update():
+    half = len(voters) // 2
+    index = registrations.VoterIndex(voters[:half])
+    index.update(voters[half:])
+
+    for month_and_year in MONTHS_AND_YEARS:
+        assert index.total_registered_voters(month_and_year) == \
+            reference_total_registered_voters(voters, month_and_year)
+    for year in YEARS:
+        assert index.new_voters_by_month(year) == \
+            reference_new_voters_by_month(voters, year)
+
+
+def test_voter_index_corrections():
+    corrections = [dict(row, **{"New registered voters": "7"})
+                   for row in voters[::3]]
+    index = registrations.VoterIndex(voters)
+    index.update(corrections)
+
+    corrected = {(row["Jurisdiction"], row["Year"], row["Month"])
+                 for row in corrections}
+    expected_rows = [
+        dict(row, **{"New registered voters": "7"})
+        if (row["Jurisdiction"], row["Year"], row["Month"]) in corrected
+        else row
+        for row in voters]
+    for month_and_year in MONTHS_AND_YEARS:
+        assert index.total_registered_voters(month_and_year) == \
+            reference_total_registered_voters(expected_rows, month_and_year)
+    for year in YEARS:
+        assert index.new_voters_by_month(year) == \
+            reference_new_voters_by_month(expected_rows, year)
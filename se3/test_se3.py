@@ -15,7 +15,8 @@ import test_helpers
 import helpers
 
 MODULE = "se3"
-voters = test_helpers.read_CSV_file("tests/new_voter_registrations.csv")
+voters = test_helpers.read_CSV_file("tests/new_voter_registrations.csv",
+                                    use_cache=True)
 
 ### Helper
 def read_config_file(filename):
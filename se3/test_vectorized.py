@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import registrations
+import test_helpers
+import vectorized
+import word_stats
+
+FILENAME = "tests/new_voter_registrations.csv"
+voters = test_helpers.read_CSV_file(FILENAME)
+YEARS = sorted({row["Year"] for row in voters}) + ["1999"]
+
+# The same data as a DataFrame of strings, a DataFrame with typed
+# columns, and structured arrays built from rows and from columns
+DATA = {"strings": pd.DataFrame(voters),
+        "typed": pd.read_csv(FILENAME),
+        "array": vectorized.to_structured_array(voters),
+        "columns": vectorized.to_structured_array(
+            test_helpers.read_csv_columns(FILENAME))}
+
+
+def test_to_structured_array():
+    array = DATA["array"]
+    assert array.dtype == vectorized.voter_dtype(
+        max(len(row["Jurisdiction"]) for row in voters))
+    assert np.array_equal(DATA["columns"], array)
+    assert [str(row["Jurisdiction"]) for row in array] == \
+        [row["Jurisdiction"] for row in voters]
+
+
+def test_empty_structured_array():
+    assert len(vectorized.to_structured_array([])) == 0
+    assert len(vectorized.to_structured_array(
+        test_helpers.VoterColumns())) == 0
+
+
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize("target", [0, 100000, 200000, 10 ** 9])
+def test_num_of_new_voters(data, target):
+    assert vectorized.num_of_new_voters(DATA[data], target) == \
+        list(registrations.stream_num_of_new_voters(voters, target))
+
+
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize("month_and_year", [("Jan", "2020"), ("Apr", "2016"),
+                                            ("Dec", "2016")])
+def test_total_registered_voters(data, month_and_year):
+    assert vectorized.total_registered_voters(DATA[data], month_and_year) == \
+        registrations.stream_total_registered_voters(voters, month_and_year)
+
+
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize("year", YEARS)
+def test_new_voters_by_month(data, year):
+    assert vectorized.new_voters_by_month(DATA[data], year) == \
+        registrations.stream_new_voters_by_month(voters, year)
+
+
+@pytest.mark.parametrize("words", [["hello", "bye", "hi", "a", "hannah", "hi",
+                                    "blue", "what", "ape"],
+                                   ["Éclair", "über", "Über"],
+                                   ["a", "", "b", ""],
+                                   ["", ""]])
+def test_words(words):
+    lengths = {word: len(word) for word in words}
+    starts = word_stats.word_stats(words).starts
+
+    for data in (np.array(words), pd.Series(words)):
+        assert vectorized.word_length(data) == lengths
+        assert vectorized.words_start_with(data) == starts
+        assert list(vectorized.words_start_with(data)) == list(starts)
@@ -0,0 +1,202 @@
+import math
+import os
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import word_stats
+
+WORD_LISTS = [[],
+              ["hello"],
+              ["hello", "bye", "hi", "a", "hannah", "hi", "blue", "what",
+               "ape"],
+              ["Éclair", "eclair", "über", "Über", "Uber", "ßa", "Ab", "á"],
+              ["a", "", "b", ""],
+              ["x" * n for n in range(100)]]
+
+
+def reference_word_length(words):
+    return {word: len(word) for word in words}
+
+
+def reference_words_start_with(words, letter=lambda ch: ch):
+    starts = {}
+    for word in words:
+        if word:
+            first = letter(word[0])
+            starts[first] = starts.get(first, 0) + 1
+    return starts
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_word_stats(words):
+    stats = word_stats.word_stats(words)
+    assert stats.lengths == reference_word_length(words)
+    assert stats.starts == reference_words_start_with(words)
+    assert stats.histogram.total == len(words)
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_word_stats_without_lengths(words):
+    stats = word_stats.word_stats(iter(words), keep_lengths=False)
+    assert stats.lengths is None
+    assert stats.starts == reference_words_start_with(words)
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_word_stats_merge(words):
+    half = len(words) // 2
+    stats = word_stats.word_stats(words[:half])
+    stats.merge(word_stats.word_stats(words[half:]))
+
+    assert stats.lengths == reference_word_length(words)
+    assert stats.starts == reference_words_start_with(words)
+    assert stats.histogram.total == len(words)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_word_stats_from_files(num_workers, tmp_path):
+    filenames = []
+    words = []
+    for i, word_list in enumerate(WORD_LISTS):
+        filename = str(tmp_path / f"words_{i}.txt")
+        with open(filename, "w") as f:
+            f.write("\n".join(" ".join(word_list[j:j + 3])
+                              for j in range(0, len(word_list), 3)))
+        filenames.append(filename)
+        words.extend(word for word in word_list if word)
+
+    stats = word_stats.word_stats_from_files(filenames, num_workers)
+    assert stats.lengths == reference_word_length(words)
+    assert list(stats.lengths) == list(reference_word_length(words))
+    assert stats.starts == reference_words_start_with(words)
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_prefix_trie_count(words):
+    trie = word_stats.PrefixTrie(words)
+    prefixes = {word[:n] for word in words for n in range(len(word) + 1)}
+    for prefix in prefixes | {"", "zz", "hellos"}:
+        assert trie.count(prefix) == \
+            sum(word.startswith(prefix) for word in words)
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+@pytest.mark.parametrize("k", [1, 2, 5])
+def test_prefix_trie_counts_at_depth(words, k):
+    expected = {}
+    for word in words:
+        if len(word) >= k:
+            expected[word[:k]] = expected.get(word[:k], 0) + 1
+
+    counts = word_stats.PrefixTrie(words).counts_at_depth(k)
+    assert counts == expected
+    assert list(counts) == list(expected)
+
+
+@pytest.mark.parametrize("letter, expected", [("a", "a"), ("A", "a"),
+                                              ("á", "a"), ("É", "e"),
+                                              ("Ü", "u"), ("ß", "s"),
+                                              ("7", "7")])
+def test_normalize_letter(letter, expected):
+    assert word_stats.normalize_letter(letter) == expected
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_word_stats_normalize(words):
+    stats = word_stats.word_stats(words, normalize=True)
+    assert stats.starts == \
+        reference_words_start_with(words, word_stats.normalize_letter)
+    assert stats.lengths == reference_word_length(words)
+
+
+def reference_percentile(lengths, p, max_length=word_stats.MAX_LENGTH):
+    lengths = sorted(min(length, max_length) for length in lengths)
+    rank = max(1, math.ceil(p / 100 * len(lengths)))
+    return lengths[rank - 1]
+
+
+@pytest.mark.parametrize("words", WORD_LISTS[1:])
+@pytest.mark.parametrize("p", [0, 1, 25, 50, 90, 99.5, 100])
+def test_length_histogram_percentile(words, p):
+    histogram = word_stats.word_stats(words).histogram
+    lengths = [len(word) for word in words]
+    assert histogram.percentile(p) == reference_percentile(lengths, p)
+    assert histogram.median() == reference_percentile(lengths, 50)
+
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_length_histogram_count(words):
+    histogram = word_stats.word_stats(words).histogram
+    max_length = histogram.max_length
+    for length in range(-2, max_length + 1):
+        if length < max_length:
+            expected = sum(len(word) == length for word in words)
+        else:
+            expected = sum(len(word) >= max_length for word in words)
+        assert histogram.count(length) == expected
+
+
+@pytest.mark.parametrize("length", [65, 70, 1000])
+def test_length_histogram_count_too_long(length):
+    histogram = word_stats.word_stats(["x" * 70] * 3).histogram
+    assert histogram.count(64) == 3
+    with pytest.raises(ValueError):
+        histogram.count(length)
+
+
+@pytest.mark.parametrize("max_length", [1, 8, 100])
+def test_word_stats_max_length(max_length, tmp_path):
+    words = ["x" * n for n in range(100)] + ["x" * 70] * 3
+    stats = word_stats.word_stats(words, max_length=max_length)
+    assert stats.histogram.max_length == max_length
+    for length in range(max_length):
+        assert stats.histogram.count(length) == \
+            sum(len(word) == length for word in words)
+    assert stats.histogram.count(max_length) == \
+        sum(len(word) >= max_length for word in words)
+
+    filename = tmp_path / "words.txt"
+    filename.write_text(" ".join(words[1:]))
+    for num_workers in [1, 2]:
+        from_files = word_stats.word_stats_from_files(
+            [filename, filename], num_workers, max_length=max_length)
+        assert from_files.histogram.max_length == max_length
+        assert from_files.histogram.total == 2 * (len(words) - 1)
+
+
+def test_length_histogram_merge():
+    first = word_stats.LengthHistogram()
+    second = word_stats.LengthHistogram()
+    for length in range(10):
+        first.add(length)
+        second.add(2 * length)
+    first.merge(second)
+
+    assert first.total == 20
+    assert first.count(0) == 2
+    assert first.count(18) == 1
+    assert first.percentile(50) == reference_percentile(
+        list(range(10)) + list(range(0, 20, 2)), 50)
+
+
+def test_length_histogram_merge_different_max_length():
+    with pytest.raises(ValueError):
+        word_stats.LengthHistogram(10).merge(word_stats.LengthHistogram(20))
+
+
+def test_length_histogram_empty():
+    histogram = word_stats.LengthHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.median() is None
+
+
+@pytest.mark.parametrize("p", [-1, 100.5, 200])
+def test_length_histogram_bad_percentile(p):
+    histogram = word_stats.word_stats(["hello"]).histogram
+    with pytest.raises(ValueError):
+        histogram.percentile(p)
@@ -0,0 +1,216 @@
+"""
+Short Exercises #3 - NumPy/pandas versions of the se3 functions
+
+Each function takes the same arguments as the function with the same name
+in se3 and returns the same result.  The vectorized version is used when
+the data is a pandas DataFrame/Series or a NumPy array; anything else is
+passed along to se3.
+"""
+
+import numpy as np
+import pandas as pd
+
+import se3
+import test_helpers
+
+FIELDS = ("Jurisdiction", "Year", "Month", "New registered voters")
+
+
+def voter_dtype(max_state_length):
+    """
+    The dtype of a structured array of newly registered voters.
+
+    Args:
+        max_state_length (int): the length of the longest state name
+
+    Returns (dtype): one field per CSV column
+    """
+
+    return np.dtype([("Jurisdiction", f"U{max(max_state_length, 1)}"),
+                     ("Year", "i2"),
+                     ("Month", "U3"),
+                     ("New registered voters", "i8")])
+
+
+def to_structured_array(registered_voters):
+    """
+    Convert newly registered voters (a list of dicts or VoterColumns) to
+    a NumPy structured array with one field per CSV column.
+
+    Args:
+        registered_voters (iterable of dicts or VoterColumns): newly
+          registered voters
+
+    Returns (ndarray): an array with the dtype from voter_dtype
+    """
+
+    if isinstance(registered_voters, test_helpers.VoterColumns):
+        return _columns_to_structured_array(registered_voters)
+
+    rows = [tuple(row[field] for field in FIELDS) for row in registered_voters]
+    max_state_length = max((len(row[0]) for row in rows), default=0)
+    return np.array(rows, dtype=voter_dtype(max_state_length))
+
+
+def _columns_to_structured_array(columns):
+    """
+    Build a structured array straight from the typed arrays of a
+    VoterColumns, without going through a dict per row.
+    """
+
+    state_names = np.array(columns.state_names, dtype=str)
+    months = np.array(test_helpers.MONTHS)
+    result = np.empty(len(columns), dtype=voter_dtype(
+        max((len(name) for name in columns.state_names), default=0)))
+    result["Jurisdiction"] = state_names[np.asarray(columns.states,
+                                                     dtype=np.intp)]
+    result["Year"] = np.asarray(columns.years)
+    result["Month"] = months[np.asarray(columns.months, dtype=np.intp) - 1]
+    result["New registered voters"] = np.asarray(columns.counts)
+    return result
+
+
+def _is_vectorized(data):
+    """
+    Is data a type handled by the functions in this module?
+    """
+
+    return isinstance(data, (pd.DataFrame, pd.Series, np.ndarray))
+
+
+def _voter_columns(registered_voters):
+    """
+    Get the states, years (as strings), months and counts (as ints) of a
+    DataFrame or structured array as NumPy arrays.
+    """
+
+    states, years, months, counts = (np.asarray(registered_voters[field])
+                                     for field in FIELDS)
+    return states, years.astype(str), months, counts.astype(np.int64)
+
+
+def _in_order_of_appearance(values):
+    """
+    Find the distinct values of an array in the order they first appear,
+    along with how many times each one appears.
+    """
+
+    distinct, first, num = np.unique(values, return_index=True,
+                                     return_counts=True)
+    order = np.argsort(first, kind="stable")
+    return distinct[order], num[order]
+
+
+def word_length(list_of_words):
+    """
+    Given a list of words, create a dictionary that maps each
+    word to the number of characters in that word.
+
+    Args:
+        list_of_words (Series, ndarray, or list of strings): list of words
+
+    Returns (dict): A dictionary that maps strings to integers.
+    """
+
+    if not _is_vectorized(list_of_words):
+        return se3.word_length(list_of_words)
+
+    words = np.asarray(list_of_words, dtype=str)
+    return dict(zip(words.tolist(), np.char.str_len(words).tolist()))
+
+
+def words_start_with(list_of_words):
+    """
+    Given a list of words, create a dictionary that maps the first letter
+    of each word to the number of words in the list that start with
+    that character.  Empty words have no first letter and are left out
+    (as in word_stats.WordStats).
+
+    Args:
+        list_of_words (Series, ndarray, or list of strings): list of words
+
+    Returns (dict): A dictionary that maps letters to integers.
+    """
+
+    if not _is_vectorized(list_of_words):
+        return se3.words_start_with(list_of_words)
+
+    words = np.asarray(list_of_words, dtype=str)
+    # Converting to a one-character string type keeps the first letter
+    first_letters = words[words != ""].astype("U1")
+    letters, num = _in_order_of_appearance(first_letters)
+    return dict(zip(letters.tolist(), num.tolist()))
+
+
+def num_of_new_voters(registered_voters, target):
+    """
+    Create a list of (state, year, month) that had at least target number
+    voters register during a month in a year.
+
+    Args:
+        registered_voters (DataFrame, structured ndarray, or list of dicts):
+            newly registered voters
+        target (int): target number of new voters
+
+    Returns (list of tuples): Entries in registered_voters that meet the
+        target number of new voters, in tuple form
+    """
+
+    if not _is_vectorized(registered_voters):
+        return se3.num_of_new_voters(registered_voters, target)
+
+    states, years, months, counts = _voter_columns(registered_voters)
+    met = counts >= target
+    return list(zip(states[met].tolist(), years[met].tolist(),
+                    months[met].tolist()))
+
+
+def total_registered_voters(registered_voters, month_and_year):
+    """
+    Build a dictionary that maps the state to how many voters
+    registered in a given month and year.
+
+    Args:
+        registered_voters (DataFrame, structured ndarray, or list of dicts):
+            newly registered voters
+        month_and_year (tuple): a month and year
+
+    Returns (dict): A dictionary that maps states (strings) to new voters
+        (strings)
+    """
+
+    if not _is_vectorized(registered_voters):
+        return se3.total_registered_voters(registered_voters, month_and_year)
+
+    month, year = month_and_year
+    states, years, months, counts = _voter_columns(registered_voters)
+    selected = (months == month) & (years == year)
+    return dict(zip(states[selected].tolist(),
+                    counts[selected].astype(str).tolist()))
+
+
+def new_voters_by_month(registered_voters, year):
+    """
+    Construct a dictionary that maps a month to a list of the number of
+    new voters registered in that month in a given year.
+
+    Args:
+        registered_voters (DataFrame, structured ndarray, or list of dicts):
+            newly registered voters
+        year (string): a year
+
+    Returns (dict): A dictionary that maps months (string) to a list of
+        new voters (list of strings)
+    """
+
+    if not _is_vectorized(registered_voters):
+        return se3.new_voters_by_month(registered_voters, year)
+
+    _, years, months, counts = _voter_columns(registered_voters)
+    selected = years == year
+    months = months[selected]
+    counts = counts[selected].astype(str)
+
+    distinct_months, _ = _in_order_of_appearance(months)
+    return {month: counts[months == month].tolist()
+            for month in distinct_months.tolist()}
@@ -0,0 +1,394 @@
+"""
+Short Exercises #3 - Support code for computing word statistics over
+large collections of words
+"""
+
+import array
+import concurrent.futures
+import itertools
+import math
+import sys
+import unicodedata
+
+# Unicode code points fit in 21 bits
+CODE_POINT_BITS = 21
+
+# Words of this length or longer share the last bin of a LengthHistogram
+MAX_LENGTH = 64
+
+
+def iter_words(filename):
+    """
+    Generate the (whitespace-separated) words in a text file one at a
+    time.  Each word is interned, so repeated words share a single string.
+
+    Args:
+        filename (string): the name of the file
+
+    Returns (generator of strings): the words in the file
+    """
+
+    with open(filename) as f:
+        for line in f:
+            for word in line.split():
+                yield sys.intern(word)
+
+
+def normalize_letter(ch):
+    """
+    Normalize a letter for bucketing: strip any accents (using the NFKD
+    decomposition) and fold the case, so "A", "a" and "á" all become "a".
+
+    Args:
+        ch (string): a single character
+
+    Returns (string): the normalized character (ch itself if nothing is
+        left after stripping accents)
+    """
+
+    decomposed = unicodedata.normalize("NFKD", ch)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    folded = stripped.casefold()
+    return folded[0] if folded else ch
+
+
+class LengthHistogram:
+    """
+    Histogram of word lengths with a fixed number of bins, which answers
+    count and percentile queries in O(max_length) time.
+
+    Attributes:
+        max_length (int): words with at least this many characters are
+            counted together in the last bin
+        bins (array of ints): bins[n] is the number of words of length n
+        total (int): the number of words
+    """
+
+    def __init__(self, max_length=MAX_LENGTH):
+        self.max_length = max_length
+        self.bins = array.array("q", [0] * (max_length + 1))
+        self.total = 0
+
+    def add(self, length):
+        """
+        Count a word.
+
+        Args:
+            length (int): the length of the word
+        """
+
+        self.bins[min(length, self.max_length)] += 1
+        self.total += 1
+
+    def merge(self, other):
+        """
+        Add the counts from another histogram with the same max_length.
+
+        Args:
+            other (LengthHistogram): the other histogram
+
+        Raises: ValueError if the histograms have different max_lengths
+        """
+
+        if other.max_length != self.max_length:
+            raise ValueError(f"Cannot merge a histogram with max_length "
+                             f"{other.max_length} into one with max_length "
+                             f"{self.max_length}")
+        for length, num in enumerate(other.bins):
+            self.bins[length] += num
+        self.total += other.total
+
+    def count(self, length):
+        """
+        How many words have a given length?  (For max_length, how many
+        words have at least that length.)
+
+        Args:
+            length (int): the length
+
+        Returns (int): the number of words
+
+        Raises: ValueError if length is greater than max_length (those
+            words are counted in the last bin, so their number is unknown)
+        """
+
+        if length > self.max_length:
+            raise ValueError(f"Length {length} is greater than the "
+                             f"histogram's max_length, {self.max_length}")
+        if length < 0:
+            return 0
+        return self.bins[length]
+
+    def percentile(self, p):
+        """
+        Find the smallest length such that at least p percent of the
+        words are no longer than it (the nearest-rank percentile).
+
+        Args:
+            p (float): the percentile, between 0 and 100
+
+        Returns (int): the length, or None if there are no words (the
+            result is max_length when it falls in the last bin)
+
+        Raises: ValueError if p is not between 0 and 100
+        """
+
+        if not 0 <= p <= 100:
+            raise ValueError(f"Percentile {p} is not between 0 and 100")
+        if self.total == 0:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for length, num in enumerate(self.bins):
+            seen += num
+            if seen >= rank:
+                return length
+        return self.max_length
+
+    def median(self):
+        """
+        Find the median word length.
+
+        Returns (int): the length, or None if there are no words
+        """
+
+        return self.percentile(50)
+
+
+class WordStats:
+    """
+    The results of word_length and words_start_with, computed together,
+    along with a histogram of the lengths of the words.
+
+    Attributes:
+        lengths (dict): maps each word to the number of characters in it,
+            or None if the statistics were computed with keep_lengths=False
+            (to bound memory use for huge vocabularies)
+        starts (dict): maps each first letter to the number of words that
+            start with it
+        histogram (LengthHistogram): lengths of all the words (repeated
+            words are counted each time)
+        normalize (boolean): bucket first letters by normalize_letter
+            rather than by the raw character
+    """
+
+    def __init__(self, normalize=False, keep_lengths=True,
+                 max_length=MAX_LENGTH):
+        self.lengths = {} if keep_lengths else None
+        self.starts = {}
+        self.histogram = LengthHistogram(max_length)
+        self.normalize = normalize
+        # Cache of normalize_letter results, by raw first letter
+        self._letters = {}
+
+    def add_words(self, words):
+        """
+        Update the statistics with more words, in a single pass.  An
+        empty word has length 0 but no first letter, so it is left out of
+        starts.
+
+        Args:
+            words (iterable of strings): the words
+        """
+
+        lengths = self.lengths
+        starts = self.starts
+        letters = self._letters
+        histogram = self.histogram
+        for word in words:
+            length = len(word)
+            histogram.add(length)
+            if lengths is not None and word not in lengths:
+                lengths[word] = length
+            if length == 0:
+                continue
+            first = word[0]
+            if self.normalize:
+                letter = letters.get(first)
+                if letter is None:
+                    letter = normalize_letter(first)
+                    letters[first] = letter
+                first = letter
+            starts[first] = starts.get(first, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the statistics for words that came after the words in self.
+
+        Args:
+            other (WordStats): statistics for the later words
+        """
+
+        if self.lengths is not None:
+            for word, length in other.lengths.items():
+                self.lengths.setdefault(word, length)
+        for first, num in other.starts.items():
+            self.starts[first] = self.starts.get(first, 0) + num
+        self.histogram.merge(other.histogram)
+
+
+def word_stats(words, normalize=False, keep_lengths=True,
+               max_length=MAX_LENGTH):
+    """
+    Compute word_length and words_start_with in one pass over the words.
+
+    Args:
+        words (iterable of strings): the words
+        normalize (boolean): bucket first letters by normalize_letter
+        keep_lengths (boolean): build the word to length dictionary
+        max_length (int): words with at least this many characters share
+            the last bin of the length histogram
+
+    Returns (WordStats): the statistics
+    """
+
+    stats = WordStats(normalize, keep_lengths, max_length)
+    stats.add_words(words)
+    return stats
+
+
+def _file_stats(filename, normalize, keep_lengths, max_length):
+    """
+    Compute the statistics for the words in one file (runs in a worker).
+    """
+
+    return word_stats(iter_words(filename), normalize, keep_lengths,
+                      max_length)
+
+
+def word_stats_from_files(filenames, num_workers=1, normalize=False,
+                          keep_lengths=True, max_length=MAX_LENGTH):
+    """
+    Compute the statistics for the words in a list of files, streaming
+    the words from each file.  With more than one worker, the files are
+    processed in a pool of processes and the results merged in the order
+    of filenames, so the result does not depend on num_workers.
+
+    Args:
+        filenames (list of strings): the names of the files
+        num_workers (int): number of processes to use
+        normalize (boolean): bucket first letters by normalize_letter
+        keep_lengths (boolean): build the word to length dictionary
+        max_length (int): words with at least this many characters share
+            the last bin of the length histogram
+
+    Returns (WordStats): the statistics
+    """
+
+    stats = WordStats(normalize, keep_lengths, max_length)
+    if num_workers <= 1:
+        for filename in filenames:
+            stats.add_words(iter_words(filename))
+        return stats
+
+    with concurrent.futures.ProcessPoolExecutor(num_workers) as pool:
+        for file_stats in pool.map(_file_stats, filenames,
+                                   itertools.repeat(normalize),
+                                   itertools.repeat(keep_lengths),
+                                   itertools.repeat(max_length)):
+            stats.merge(file_stats)
+    return stats
+
+
+class PrefixTrie:
+    """
+    A trie of words that counts how many words start with any prefix.
+
+    The nodes are stored in parallel arrays rather than as objects, and
+    the edges in a single dictionary keyed by the parent node and the
+    code point of the character, so a lookup takes O(len(prefix)) time.
+    Node 0 is the root (the empty prefix).
+
+    Attributes:
+        parents (array of ints): the parent of each node
+        labels (array of ints): code point of the character on the edge
+            into each node
+        depths (array of ints): length of the prefix for each node
+        counts (array of ints): number of words that start with the
+            prefix for each node
+        edges (dict): maps (parent << CODE_POINT_BITS | code point) to the
+            child node
+    """
+
+    def __init__(self, words=()):
+        """
+        Build a trie of words.
+
+        Args:
+            words (iterable of strings): the words
+        """
+
+        self.parents = array.array("i", [-1])
+        self.labels = array.array("I", [0])
+        self.depths = array.array("I", [0])
+        self.counts = array.array("q", [0])
+        self.edges = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """
+        Add a word (repeats are counted again).
+
+        Args:
+            word (string): the word
+        """
+
+        node = 0
+        self.counts[0] += 1
+        for ch in word:
+            key = node << CODE_POINT_BITS | ord(ch)
+            child = self.edges.get(key)
+            if child is None:
+                child = len(self.counts)
+                self.edges[key] = child
+                self.parents.append(node)
+                self.labels.append(ord(ch))
+                self.depths.append(self.depths[node] + 1)
+                self.counts.append(0)
+            node = child
+            self.counts[node] += 1
+
+    def count(self, prefix):
+        """
+        How many words start with prefix?
+
+        Args:
+            prefix (string): the prefix
+
+        Returns (int): the number of words
+        """
+
+        node = 0
+        for ch in prefix:
+            node = self.edges.get(node << CODE_POINT_BITS | ord(ch))
+            if node is None:
+                return 0
+        return self.counts[node]
+
+    def _prefix(self, node):
+        """
+        Get the prefix for a node.
+        """
+
+        chars = []
+        while node > 0:
+            chars.append(chr(self.labels[node]))
+            node = self.parents[node]
+        return "".join(reversed(chars))
+
+    def counts_at_depth(self, k):
+        """
+        Map each prefix of length k to the number of words that start
+        with it (words shorter than k are not included).  With k = 1 this
+        is the same as words_start_with.
+
+        Args:
+            k (int): the length of the prefixes
+
+        Returns (dict): A dictionary that maps prefixes to integers, in
+            the order in which the prefixes first appeared
+        """
+
+        return {self._prefix(node): self.counts[node]
+                for node, depth in enumerate(self.depths) if depth == k}
@@ -0,0 +1,335 @@
+"""
+Short Exercises #4 - Bitboard version of the battleship board
+
+A BitBoard has the same methods as se4.Board, but stores the cells
+covered by each ship and the cells that have been shot as the bits of
+integers: cell (row, col) is bit row * size + col.  The list of lists of
+strings representation is only built when the board attribute is used.
+Each board can have its own size and set of ships.
+
+The fleet (ship_cells and cell_ships) does not change once it has been
+deployed, so clones of a board share it and only copy the state that
+moves change.
+"""
+
+import copy
+import functools
+import itertools
+import operator
+
+from se4 import SIZE, SHIP_SIZES
+from tables import tables_for
+
+# Rendering styles for BitBoard.render: "plain" is the format of
+# Board.__str__, "compact" leaves out the spaces, and "color" is plain
+# with ANSI colors (blue water, red hits)
+STYLES = ("plain", "compact", "color")
+ANSI_WATER = "\033[34m"
+ANSI_HIT = "\033[31m"
+ANSI_RESET = "\033[0m"
+
+# Result codes for BitBoard.play_moves: MISS, HIT_CODE, or SUNK + the index
+# of the ship in ship_names
+MISS = 0
+HIT_CODE = 1
+SUNK = 2
+
+
+class BitBoard:
+    """
+    Class for representing the state of the game board as bitsets
+
+    Attributes
+    ----------
+    size: (int) the number of rows (and columns) in the board
+    ship_sizes: (dict) maps each type of ship to its length
+    ship_names: (list of strings) the types of ships
+    results: (list of strings) the result for each result code
+    tables: (BoardTables) the precomputed tables for boards of this size
+    ship_cells: (dict) maps each ship to the bitset of the cells it covers
+    cell_ships: (list of strings) the ship in each cell (None for water),
+        indexed by bit number
+    remaining: (dict) maps each ship to the number of its cells that have
+        not been hit
+    shots: (int) bitset of the cells that have been shot at
+    num_ships: (int) the number of ships that have yet to be sunk
+    board: (list of lists of strings) the current state of the board,
+        as in se4.Board (computed on demand)
+    row_cache: (dict) maps each rendering style that has been used to a
+        list with the rendered string for each row (None if the row has
+        changed since it was last rendered)
+    """
+
+    def __init__(self, size=SIZE, ship_sizes=SHIP_SIZES):
+        """
+        Construct an empty board
+
+        Args:
+            size: (int) the number of rows (and columns) in the board
+            ship_sizes: (dict) maps each type of ship to its length
+        """
+
+        self.size = size
+        self.ship_sizes = ship_sizes
+        self.ship_names = list(ship_sizes)
+        self.results = ["Miss", "Hit"] + self.ship_names
+        self.tables = tables_for(size)
+        self.ship_cells = {}
+        self.cell_ships = [None] * self.tables.num_cells
+        self.remaining = {}
+        self.shots = 0
+        self.num_ships = 0
+        self.row_cache = {}
+
+    def deploy_fleet(self, fleet_locations):
+        """
+        Add ships to the board.
+
+        Args:
+            fleet_locations: a dictionary that maps each ship to the
+              (row, col) of its leftmost cell, or to (row, col, vertical)
+              (see BoardTables.ship_cell_numbers).
+
+        Raises: ValueError if a ship does not fit on the board, overlaps
+            another ship, or is already on the board (no ships are added)
+        """
+
+        # Check every ship before placing any of them
+        occupied = functools.reduce(operator.or_, self.ship_cells.values(), 0)
+        ship_cell_numbers = {}
+        ship_cells = {}
+        for ship, location in fleet_locations.items():
+            if ship in self.ship_cells:
+                raise ValueError(f"{ship} is already on the board")
+            numbers = self.tables.ship_cell_numbers(self.ship_sizes[ship],
+                                                    location)
+            cells = functools.reduce(
+                operator.or_,
+                map(self.tables.cell_bits.__getitem__, numbers), 0)
+            if occupied & cells:
+                raise ValueError(f"{ship} at {location} overlaps another ship")
+            occupied |= cells
+            ship_cell_numbers[ship] = numbers
+            ship_cells[ship] = cells
+
+        # Copy the fleet before changing it, in case it is shared with a
+        # clone
+        self.ship_cells = dict(self.ship_cells)
+        self.cell_ships = list(self.cell_ships)
+        for ship, numbers in ship_cell_numbers.items():
+            for i in numbers:
+                self.cell_ships[i] = ship
+            self.ship_cells[ship] = ship_cells[ship]
+            self.remaining[ship] = self.ship_sizes[ship]
+            self.num_ships += 1
+
+        self.row_cache.clear()
+
+    def play_move(self, loc):
+        """
+        Play a move in the game
+
+        Args:
+            loc: (int, int) a location in the board
+
+        Returns: (string) "Miss" if the location contained water (or a
+            piece of a ship that was already hit), "Hit" if the location
+            contained a piece of a ship, but not the last piece in the
+            ship.  The ship type if the location contained the last piece
+            of a given ship.
+
+        Raises: ValueError if loc is not in the board
+        """
+
+        row, col = loc
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise ValueError(f"{loc} is not a location in the board")
+
+        i = row * self.size + col
+        bit = 1 << i
+        ship = self.cell_ships[i]
+        if ship is None or self.shots & bit:
+            self.shots |= bit
+            return "Miss"
+
+        self.shots |= bit
+        for rows in self.row_cache.values():
+            rows[row] = None
+        self.remaining[ship] -= 1
+        if self.remaining[ship] > 0:
+            return "Hit"
+        self.num_ships -= 1
+        return ship
+
+    def play_moves(self, locs):
+        """
+        Play a sequence of moves.  Every location is checked before any of
+        the moves is played.
+
+        Args:
+            locs: (iterable of (row, col) pairs, such as tuples or lists,
+              or N x 2 array of ints) the locations to shoot at, in order
+
+        Returns: (bytearray) the result code for each move (see results):
+            the same outcome play_move would report, so a shot at water or
+            at a cell that was already shot at (earlier in locs or before)
+            is a miss
+
+        Raises: ValueError if any of the locations is not in the board
+        """
+
+        locs = locs.tolist() if hasattr(locs, "tolist") else list(locs)
+        try:
+            cells = list(map(self.tables.cell_numbers.__getitem__,
+                             map(tuple, locs)))
+        except (KeyError, TypeError):
+            for loc in locs:
+                try:
+                    self.tables.cell_numbers[tuple(loc)]
+                except (KeyError, TypeError):
+                    raise ValueError(f"{loc} is not a location in the "
+                                     "board") from None
+
+        # Water is a miss however often it is shot at, so only the moves
+        # at ship cells are looked at one by one.
+        ships = list(map(self.cell_ships.__getitem__, cells))
+        codes = bytearray(len(cells))
+        shots = self.shots
+        changed_rows = set()
+        for k in itertools.compress(range(len(cells)), ships):
+            i = cells[k]
+            bit = 1 << i
+            if shots & bit:
+                continue
+            shots |= bit
+            ship = ships[k]
+            changed_rows.add(i // self.size)
+            self.remaining[ship] -= 1
+            if self.remaining[ship] > 0:
+                codes[k] = HIT_CODE
+            else:
+                codes[k] = SUNK + self.ship_names.index(ship)
+                self.num_ships -= 1
+
+        self.shots = functools.reduce(
+            operator.or_, map(self.tables.cell_bits.__getitem__, cells), shots)
+        for rows in self.row_cache.values():
+            for row in changed_rows:
+                rows[row] = None
+        return codes
+
+    def snapshot(self):
+        """
+        Save the parts of the board that change when a move is played.
+
+        Returns: (tuple) the state, to pass to restore
+        """
+
+        return (self.shots, dict(self.remaining), self.num_ships)
+
+    def restore(self, snapshot):
+        """
+        Put the board back into a state saved by snapshot.  Only the rows
+        with ship cells whose state differs are rendered again.
+
+        Args:
+            snapshot: (tuple) a state returned by snapshot
+        """
+
+        shots, remaining, num_ships = snapshot
+        changed = (self.shots ^ shots) & sum(self.ship_cells.values())
+        self.shots = shots
+        self.remaining = dict(remaining)
+        self.num_ships = num_ships
+        if changed:
+            for row, mask in enumerate(self.tables.row_masks):
+                if changed & mask:
+                    for rows in self.row_cache.values():
+                        rows[row] = None
+
+    def clone(self):
+        """
+        Make a copy of the board that can be played independently.  The
+        copy shares the fleet with this board.
+
+        Returns: (BitBoard) the copy
+        """
+
+        board = copy.copy(self)
+        board.remaining = dict(self.remaining)
+        board.row_cache = {style: list(rows)
+                           for style, rows in self.row_cache.items()}
+        return board
+
+    def is_game_over(self):
+        """Have all the ships been sunk?"""
+
+        return self.num_ships == 0
+
+    @property
+    def board(self):
+        """
+        The state of the board as a list of lists of strings: "Water",
+        "Hit", or the name of the ship in each cell.
+        """
+
+        grid = [["Water"] * self.size for _ in range(self.size)]
+        for i, ship in enumerate(self.cell_ships):
+            if ship is not None:
+                grid[i // self.size][i % self.size] = \
+                    "Hit" if self.shots >> i & 1 else ship
+        return grid
+
+    def _render_row(self, row, style):
+        """
+        Render one row of the board in the given style.
+        """
+
+        first = row * self.size
+        row_shots = self.shots >> first
+        letters = []
+        for col, ship in enumerate(self.cell_ships[first:first + self.size]):
+            if ship is None:
+                letter = "W"
+            elif row_shots >> col & 1:
+                letter = "H"
+            else:
+                letter = ship[0]
+
+            if style == "color" and letter == "W":
+                letter = ANSI_WATER + letter + ANSI_RESET
+            elif style == "color" and letter == "H":
+                letter = ANSI_HIT + letter + ANSI_RESET
+            letters.append(letter)
+
+        separator = "" if style == "compact" else " "
+        return separator.join(letters) + "\n"
+
+    def render(self, style="plain"):
+        """
+        Generate a string representation of the board.  Rows are rendered
+        once and reused until a move changes them.
+
+        Args:
+            style: (string) one of STYLES
+
+        Returns: (string) one line per row, with the first letter of each
+            cell: W (water), H (hit), or the first letter of the ship
+
+        Raises: ValueError if style is not one of STYLES
+        """
+
+        if style not in self.row_cache:
+            if style not in STYLES:
+                raise ValueError(f"Unknown style {style!r}")
+            self.row_cache[style] = [None] * self.size
+        rows = self.row_cache[style]
+        for row, text in enumerate(rows):
+            if text is None:
+                rows[row] = self._render_row(row, style)
+        return "".join(rows)
+
+    def __str__(self):
+        """ Generate a string representation of the board"""
+
+        return self.render()
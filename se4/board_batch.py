@@ -0,0 +1,181 @@
+"""
+Short Exercises #4 - A batch of battleship boards stored as NumPy arrays
+
+Moves are applied to every board in the batch at once.  The results use
+the same rules as se4.Board.play_move, but are returned as small integer
+codes (see BoardBatch.results) rather than strings.
+"""
+
+import numpy as np
+
+from se4 import SIZE, SHIP_SIZES
+from tables import tables_for
+from bitboard import MISS, HIT_CODE, SUNK
+
+# Cell values: WATER, 1 + the index of a ship in ship_names, or HIT
+WATER = 0
+HIT = 255
+
+
+class BoardBatch:
+    """
+    Class for representing the state of many game boards
+
+    Attributes
+    ----------
+    size: (int) the number of rows (and columns) in each board
+    ship_sizes: (dict) maps each type of ship to its length
+    ship_names: (list of strings) the types of ships
+    results: (list of strings) the result for each result code
+    cells: (N x size x size array of uint8) the value of every cell
+    remaining: (N x len(ship_names) array of int16) the number of cells of
+        each ship that have not been hit
+    """
+
+    def __init__(self, num_boards, size=SIZE, ship_sizes=SHIP_SIZES):
+        """
+        Construct a batch of empty boards
+
+        Args:
+            num_boards: (int) the number of boards
+            size: (int) the number of rows (and columns) in each board
+            ship_sizes: (dict) maps each type of ship to its length
+
+        Raises: ValueError if there are too many types of ships for the
+            cell values
+        """
+
+        if len(ship_sizes) >= HIT:
+            raise ValueError(f"A batch can have at most {HIT - 1} types of "
+                             f"ships, not {len(ship_sizes)}")
+        self.size = size
+        self.ship_sizes = ship_sizes
+        self.ship_names = list(ship_sizes)
+        self.results = ["Miss", "Hit"] + self.ship_names
+        self.cells = np.full((num_boards, size, size), WATER, dtype=np.uint8)
+        self.remaining = np.zeros((num_boards, len(self.ship_names)),
+                                  dtype=np.int16)
+
+    @classmethod
+    def from_fleets(cls, fleets, size=SIZE, ship_sizes=SHIP_SIZES):
+        """
+        Construct a batch with one board per fleet.
+
+        Args:
+            fleets: (list of dicts) fleet locations, as passed to
+              Board.deploy_fleet
+            size: (int) the number of rows (and columns) in each board
+            ship_sizes: (dict) maps each type of ship to its length
+
+        Returns: (BoardBatch) the boards
+        """
+
+        batch = cls(len(fleets), size, ship_sizes)
+        for i, fleet_locations in enumerate(fleets):
+            batch.deploy_fleet(i, fleet_locations)
+        return batch
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def deploy_fleet(self, i, fleet_locations):
+        """
+        Add ships to one of the boards.
+
+        Args:
+            i: (int) the index of the board
+            fleet_locations: a dictionary that maps each ship to the
+              (row, col) of its leftmost cell, or to (row, col, vertical)
+              (see BoardTables.ship_cell_numbers).
+
+        Raises: ValueError if a ship does not fit on the board, overlaps
+            another ship, or is already on the board (no ships are added)
+        """
+
+        tables = tables_for(self.size)
+        cells = self.cells[i].reshape(-1)
+        # Check every ship before placing any of them
+        taken = cells != WATER
+        ships = []
+        for ship, location in fleet_locations.items():
+            ship_index = self.ship_names.index(ship)
+            if self.remaining[i, ship_index]:
+                raise ValueError(f"{ship} is already on board {i}")
+            numbers = tables.ship_cell_numbers(self.ship_sizes[ship], location)
+            if taken[numbers].any():
+                raise ValueError(f"{ship} at {location} overlaps another ship")
+            taken[numbers] = True
+            ships.append((ship_index, numbers))
+
+        for ship_index, numbers in ships:
+            cells[numbers] = ship_index + 1
+            self.remaining[i, ship_index] = len(numbers)
+
+    def play_moves(self, locs):
+        """
+        Play one move on every board.
+
+        Args:
+            locs: (N x 2 array of ints) the (row, col) to shoot at on each
+              board
+
+        Returns: (array of uint8) the result code for each board (see
+            results): the same outcome play_move would report, so a shot
+            at water or at a cell that was already hit is a miss
+        """
+
+        locs = np.asarray(locs)
+        if locs.shape != (len(self), 2):
+            raise ValueError(f"Expected {len(self)} moves, got {locs.shape}")
+        rows = locs[:, 0]
+        cols = locs[:, 1]
+        if np.any((rows < 0) | (rows >= self.size)
+                  | (cols < 0) | (cols >= self.size)):
+            raise ValueError("Every move must be a location in the board")
+
+        boards = np.arange(len(self))
+        shot = self.cells[boards, rows, cols]
+        hit = (shot != WATER) & (shot != HIT)
+
+        hit_boards = boards[hit]
+        hit_ships = shot[hit].astype(np.intp) - 1
+        self.cells[hit_boards, rows[hit], cols[hit]] = HIT
+        self.remaining[hit_boards, hit_ships] -= 1
+
+        results = np.full(len(self), MISS, dtype=np.uint8)
+        sunk = self.remaining[hit_boards, hit_ships] == 0
+        results[hit_boards] = np.where(sunk, SUNK + hit_ships, HIT_CODE)
+        return results
+
+    def num_ships(self):
+        """
+        The number of ships that have yet to be sunk on each board
+
+        Returns: (array of ints)
+        """
+
+        return np.count_nonzero(self.remaining, axis=1)
+
+    def is_game_over(self):
+        """
+        Have all the ships been sunk on each board?
+
+        Returns: (array of bools)
+        """
+
+        return ~self.remaining.any(axis=1)
+
+    def board(self, i):
+        """
+        Get one board as a list of lists of strings, as in se4.Board.
+
+        Args:
+            i: (int) the index of the board
+
+        Returns: (list of lists of strings) "Water", "Hit", or a ship name
+            in each cell
+        """
+
+        names = ["Water"] + self.ship_names
+        return [["Hit" if v == HIT else names[v] for v in row]
+                for row in self.cells[i].tolist()]
@@ -0,0 +1,175 @@
+"""
+Short Exercises #4 - Probability-density targeting
+
+The shooter keeps, for every cell, the number of ways the ships that are
+still afloat could be placed so that they cover the cell, without
+overlapping a cell that is known to be empty.  It shoots at the cell with
+the most placements.  After a hit, it concentrates on the placements that
+go through the cells that were hit until the ship is sunk.
+
+The counts are updated incrementally: a miss only touches the placements
+that cover the cell that was missed, and a sinking only touches the
+placements of ships of that length.
+"""
+
+import collections
+
+from se4 import SIZE, SHIP_SIZES
+from tables import tables_for
+
+
+class DensityShooter:
+    """
+    Class for choosing shots by probability density
+
+    Attributes
+    ----------
+    size: (int) the number of rows (and columns) in the board
+    ship_sizes: (dict) maps each type of ship to its length
+    afloat: (Counter) maps a ship length to the number of ships of that
+        length that have not been sunk
+    legal: (dict) maps a ship length to a bytearray with a 1 for each
+        placement (see tables.Placements) that is still possible
+    density: (list of ints) the number of possible placements, over the
+        ships that are afloat, that cover each cell
+    shot: (bytearray) 1 for each cell that has been shot at
+    hits: (set of ints) cells that were hit and whose ship is afloat
+    """
+
+    def __init__(self, size=SIZE, ship_sizes=SHIP_SIZES):
+        """
+        Construct a shooter for a board with nothing shot at yet
+
+        Args:
+            size: (int) the number of rows (and columns) in the board
+            ship_sizes: (dict) maps each type of ship to its length
+        """
+
+        self.size = size
+        self.ship_sizes = ship_sizes
+        self.tables = tables_for(size)
+        self.afloat = collections.Counter(ship_sizes.values())
+        self.legal = {}
+        self.density = [0] * self.tables.num_cells
+        for length, num in self.afloat.items():
+            placements = self.tables.placements(length)
+            self.legal[length] = bytearray(b"\1" * len(placements))
+            for cells in placements.cells:
+                for i in cells:
+                    self.density[i] += num
+        self.shot = bytearray(self.tables.num_cells)
+        self.hits = set()
+
+    def _block(self, cell):
+        """
+        Rule out every placement that covers a cell known not to hold a
+        ship that is afloat.
+        """
+
+        for length, num in self.afloat.items():
+            if num == 0:
+                continue
+            placements = self.tables.placements(length)
+            legal = self.legal[length]
+            for p in placements.covering[cell]:
+                if legal[p]:
+                    legal[p] = 0
+                    for i in placements.cells[p]:
+                        self.density[i] -= num
+
+    def _sink(self, length, cell):
+        """
+        Remove a sunk ship of the given length, whose last piece was at
+        cell, from the counts.
+        """
+
+        placements = self.tables.placements(length)
+        legal = self.legal[length]
+
+        # The ship was in a possible placement through cell that was hit
+        # everywhere.
+        sunk_cells = ()
+        for p in placements.covering[cell]:
+            if legal[p] and all(i in self.hits for i in placements.cells[p]):
+                sunk_cells = placements.cells[p]
+                break
+
+        self.afloat[length] -= 1
+        for p, is_legal in enumerate(legal):
+            if is_legal:
+                for i in placements.cells[p]:
+                    self.density[i] -= 1
+
+        for i in sunk_cells:
+            self.hits.discard(i)
+            self._block(i)
+
+    def record(self, loc, result):
+        """
+        Update the counts with the result of a shot.
+
+        Args:
+            loc: (int, int) the location that was shot at
+            result: (string) the result returned by play_move
+        """
+
+        row, col = loc
+        cell = row * self.size + col
+        self.shot[cell] = 1
+        if result == "Miss":
+            self._block(cell)
+        elif result == "Hit":
+            self.hits.add(cell)
+        else:
+            self.hits.add(cell)
+            self._sink(self.ship_sizes[result], cell)
+
+    def _target_density(self):
+        """
+        Count the possible placements through the cells that were hit,
+        weighted by how many of those cells each one covers.
+        """
+
+        target = collections.Counter()
+        for length, num in self.afloat.items():
+            if num == 0:
+                continue
+            placements = self.tables.placements(length)
+            legal = self.legal[length]
+            seen = set()
+            for hit in self.hits:
+                for p in placements.covering[hit]:
+                    if legal[p] and p not in seen:
+                        seen.add(p)
+                        cells = placements.cells[p]
+                        weight = num * sum(i in self.hits for i in cells)
+                        for i in cells:
+                            if not self.shot[i]:
+                                target[i] += weight
+        return target
+
+    def next_shot(self):
+        """
+        Choose the next location to shoot at.
+
+        Returns: (int, int) the unshot location with the highest density
+            (the first one, in row-major order, if there is a tie), or
+            None if every location has been shot at
+        """
+
+        best = None
+        if self.hits:
+            target = self._target_density()
+            if target:
+                best = min(target, key=lambda i: (-target[i], i))
+
+        if best is None:
+            best_density = -1
+            for i, d in enumerate(self.density):
+                if d > best_density and not self.shot[i]:
+                    best = i
+                    best_density = d
+            if best is None:
+                return None
+
+        return divmod(best, self.size)
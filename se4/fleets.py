@@ -0,0 +1,223 @@
+"""
+Short Exercises #4 - Fast generation of random fleets
+
+Unlike generate_random_game, which puts each ship in its own row, the
+fleets generated here can have ships anywhere on the board, horizontal
+or vertical.  Each fleet is equally likely among all of the ways to
+place the ships without overlapping.
+"""
+
+import random
+
+from se4 import SIZE, SHIP_SIZES
+from tables import tables_for
+
+# Maps (size, ship lengths) to what _place() returned for those ships,
+# filled in by _check_fits()
+_FITS = {}
+
+# Maps (size, k) to the bitsets of the cells with each value of
+# (row + col) % k and of (row - col) % k, filled in by _color_masks()
+_COLORS = {}
+
+# The most positions _place() visits before giving up
+_SEARCH_LIMIT = 50_000
+
+# The number of times random_fleet() redraws a fleet with overlapping
+# ships before placing the ships one at a time instead
+_MAX_REDRAWS = 1000
+
+
+def _color_masks(size, k):
+    """
+    Get the bitsets of the cells of each "color" (row + col) % k and
+    (row - col) % k.  A ship of length L covers at least L // k cells of
+    every color.
+    """
+
+    if (size, k) not in _COLORS:
+        masks = [0] * (2 * k)
+        for r in range(size):
+            for c in range(size):
+                bit = 1 << (r * size + c)
+                masks[(r + c) % k] |= bit
+                masks[k + (r - c) % k] |= bit
+        _COLORS[size, k] = masks
+    return _COLORS[size, k]
+
+
+def _place(tables, lengths, rng=None):
+    """
+    Place ships without overlapping, by a depth-first search that
+    remembers the positions (ships left and cells occupied) that failed,
+    and that cuts off positions where the cells that some ship could
+    still cover are too few for the ships that are left.
+
+    Args:
+        tables: (BoardTables) the tables for the board
+        lengths: (list of ints) the length of each ship, longest first
+        rng: (random.Random) if not None, try each ship's placements in
+          a random order instead of in order
+
+    Returns: (list of ints, bool) the index of each ship's placement (see
+        tables.Placements) or None if none was found, and whether the
+        search finished (so that None means that the ships do not fit)
+    """
+
+    masks_by_ship = [tables.placements(length).masks for length in lengths]
+    distinct = sorted(set(lengths))
+    failed = set()
+    nodes = 0
+
+    def fits(i, occupied):
+        """
+        Is there room for ships i, i + 1, ... on the free cells?
+        """
+
+        coverable = 0
+        for length in distinct:
+            if length > lengths[i]:
+                break
+            for mask in tables.placements(length).masks:
+                if not occupied & mask:
+                    coverable |= mask
+        for k in distinct:
+            if k > lengths[i]:
+                break
+            need = sum(length // k for length in lengths[i:])
+            for color in _color_masks(tables.size, k):
+                if (coverable & color).bit_count() < need:
+                    return False
+        return True
+
+    def search(i, occupied):
+        nonlocal nodes
+        if i == len(lengths):
+            return []
+        if (i, occupied) in failed or nodes >= _SEARCH_LIMIT:
+            return None
+        nodes += 1
+
+        if fits(i, occupied):
+            masks = masks_by_ship[i]
+            order = range(len(masks))
+            if rng is not None:
+                order = list(order)
+                rng.shuffle(order)
+            for p in order:
+                if not occupied & masks[p]:
+                    rest = search(i + 1, occupied | masks[p])
+                    if rest is not None:
+                        return [p] + rest
+        if nodes < _SEARCH_LIMIT:
+            failed.add((i, occupied))
+        return None
+
+    found = search(0, 0)
+    return found, found is not None or nodes < _SEARCH_LIMIT
+
+
+def _check_fits(tables, lengths):
+    """
+    Check (once per board size and set of ship lengths) that the ships
+    can be placed on the board together.  If the search gives up, the
+    ships are assumed to fit.
+
+    Args:
+        tables: (BoardTables) the tables for the board
+        lengths: (list of ints) the length of each ship
+
+    Returns: (list of ints) a placement of the ships, longest first (see
+        _place()), or None if the search gave up
+
+    Raises: ValueError if they cannot
+    """
+
+    key = (tables.size, tuple(sorted(lengths, reverse=True)))
+    if key not in _FITS:
+        _FITS[key] = _place(tables, list(key[1]))
+    found, finished = _FITS[key]
+    if found is None and finished:
+        raise ValueError(f"Ships of lengths {list(key[1])} do not fit on a "
+                         f"{tables.size} x {tables.size} board")
+    return found
+
+
+def random_fleet(rng, ships=None, size=SIZE, ship_sizes=SHIP_SIZES):
+    """
+    Place ships on the board at random.  Each ship gets an independent,
+    uniformly chosen placement and the whole fleet is redrawn if any two
+    ships overlap, so every non-overlapping fleet is equally likely.  A
+    fleet so crowded that _MAX_REDRAWS redraws all overlap is instead
+    placed one ship at a time (longest first), in random placements,
+    backtracking when a ship does not fit, or if that search gives up,
+    in the placement found by _check_fits() (with the ships of each
+    length shuffled).  Those fleets are not all equally likely.
+
+    Args:
+        rng: (random.Random) source of random numbers
+        ships: (list of strings) the ships to place (defaults to every
+          ship in ship_sizes)
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+
+    Returns: (dict) maps each ship to its (row, col, vertical)
+
+    Raises: ValueError if the ships cannot all be placed on the board,
+        or if no placement was found for a fleet that might fit
+    """
+
+    if ships is None:
+        ships = list(ship_sizes)
+    tables = tables_for(size)
+    fits = _check_fits(tables, [ship_sizes[ship] for ship in ships])
+    choices = []
+    for ship in ships:
+        placements = tables.placements(ship_sizes[ship])
+        choices.append((ship, len(placements), placements.masks,
+                        placements.locations))
+
+    for _ in range(_MAX_REDRAWS):
+        occupied = 0
+        fleet = {}
+        for ship, num, masks, locations in choices:
+            i = int(rng.random() * num)
+            if occupied & masks[i]:
+                break
+            occupied |= masks[i]
+            fleet[ship] = locations[i]
+        else:
+            return fleet
+
+    ships = sorted(ships, key=lambda ship: ship_sizes[ship], reverse=True)
+    found, _ = _place(tables, [ship_sizes[ship] for ship in ships], rng)
+    if found is None:
+        if fits is None:
+            raise ValueError(f"Could not find a placement for ships {ships} "
+                             f"on a {size} x {size} board")
+        rng.shuffle(ships)
+        ships.sort(key=lambda ship: ship_sizes[ship], reverse=True)
+        found = fits
+    return {ship: tables.placements(ship_sizes[ship]).locations[p]
+            for ship, p in zip(ships, found)}
+
+
+def generate_fleets(num_fleets, seed=0, ships=None, size=SIZE,
+                    ship_sizes=SHIP_SIZES):
+    """
+    Generate random fleets reproducibly.
+
+    Args:
+        num_fleets: (int) the number of fleets
+        seed: (int) seed for the random number generator
+        ships: (list of strings) the ships to place (defaults to every
+          ship in ship_sizes)
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+
+    Returns: (list of dicts) the fleets (see random_fleet)
+    """
+
+    rng = random.Random(seed)
+    return [random_fleet(rng, ships, size, ship_sizes)
+            for _ in range(num_fleets)]
@@ -0,0 +1,178 @@
+"""
+Short Exercises #4 - Recording and replaying games
+
+A game log has one JSON object per line (as written by se4.Game):
+
+    {"ships": {"Carrier": [4, 4]}, "size": 10, "ship_sizes": {"Carrier": 5}}
+    {"move": [4, 6], "result": "Hit"}
+    ...
+    {"concede": 12}          (only if the player conceded)
+
+The first line is the fleet, the board size, and the length of each type
+of ship, and each following line is a move and the result that play_move
+returned.  Logs without ship_sizes use SHIP_SIZES.
+"""
+
+import json
+
+from se4 import SIZE, SHIP_SIZES
+from bitboard import BitBoard
+
+
+def write_log(f, ships, moves, results, size=SIZE, ship_sizes=SHIP_SIZES):
+    """
+    Write a game that was played without se4.Game (for example, by the
+    simulator) as a log.
+
+    Args:
+        f: (file) where to write the log
+        ships: (dict) maps ships to starting locations
+        moves: (list of (int, int)) the moves
+        results: (list of strings) the result of each move
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+    """
+
+    header = {"ships": ships, "size": size, "ship_sizes": ship_sizes}
+    f.write(json.dumps(header, separators=(",", ":")) + "\n")
+    for loc, result in zip(moves, results):
+        f.write(json.dumps({"move": loc, "result": result},
+                           separators=(",", ":")) + "\n")
+
+
+def read_log(f):
+    """
+    Read a game log.
+
+    Args:
+        f: (file) the log
+
+    Returns: (dict, list of (int, int), list of strings) the first line of
+        the log (with the ships, size, and ship sizes), the moves, and
+        their results
+    """
+
+    header = json.loads(f.readline())
+    moves = []
+    results = []
+    for line in f:
+        event = json.loads(line)
+        if "move" in event:
+            moves.append(tuple(event["move"]))
+            results.append(event["result"])
+    return header, moves, results
+
+
+class Replay:
+    """
+    Class for re-playing a recorded game on a BitBoard
+
+    Attributes
+    ----------
+    moves: (list of (int, int)) the moves in the game
+    results: (list of strings) the recorded result of each move
+    board: (BitBoard) the board, in the state after the first position
+        moves
+    position: (int) the number of moves that have been applied to board
+    checkpoint_every: (int) how often (in moves) to save a checkpoint
+    checkpoints: (list) snapshots of the board after 0, checkpoint_every,
+        2 * checkpoint_every, ... moves (filled in as moves are applied)
+    """
+
+    def __init__(self, header, moves, results, checkpoint_every=64):
+        """
+        Set up a replay of a game, with no moves applied.
+
+        Args:
+            header: (dict) the first line of the log (see read_log)
+            moves: (list of (int, int)) the moves
+            results: (list of strings) the result of each move
+            checkpoint_every: (int) how often (in moves) to save a
+              checkpoint for seek
+
+        Raises: ValueError if checkpoint_every is not positive
+        """
+
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be positive, not "
+                             f"{checkpoint_every}")
+        self.moves = moves
+        self.results = results
+        self.board = BitBoard(header.get("size", SIZE),
+                              header.get("ship_sizes", SHIP_SIZES))
+        self.board.deploy_fleet(header["ships"])
+        self.position = 0
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = [self.board.snapshot()]
+
+    def step(self):
+        """
+        Apply the next move.
+
+        Returns: (string) the result of the move
+
+        Raises: ValueError if the result is not the one in the log (the
+            board is left as it was before the move)
+        """
+
+        loc = self.moves[self.position]
+        snapshot = self.board.snapshot()
+        result = self.board.play_move(loc)
+        if result != self.results[self.position]:
+            self.board.restore(snapshot)
+            raise ValueError(f"Move {self.position} {loc}: the log says "
+                             f"{self.results[self.position]}, but the "
+                             f"board says {result}")
+        self.position += 1
+        if self.position % self.checkpoint_every == 0 and \
+           self.position // self.checkpoint_every == len(self.checkpoints):
+            self.checkpoints.append(self.board.snapshot())
+        return result
+
+    def seek(self, k):
+        """
+        Put the board in the state after the first k moves, starting from
+        the closest checkpoint at or before move k.
+
+        Args:
+            k: (int) the number of moves
+
+        Returns: (BitBoard) the board
+
+        Raises: ValueError if k is not between 0 and the number of moves
+        """
+
+        if not 0 <= k <= len(self.moves):
+            raise ValueError(f"Cannot seek to move {k} of {len(self.moves)}")
+        i = min(k // self.checkpoint_every, len(self.checkpoints) - 1)
+        start = i * self.checkpoint_every
+        if k < self.position or start > self.position:
+            self.board.restore(self.checkpoints[i])
+            self.position = start
+
+        while self.position < k:
+            self.step()
+        return self.board
+
+    def run(self):
+        """
+        Apply all of the remaining moves.
+
+        Returns: (BitBoard) the board at the end of the game
+        """
+
+        return self.seek(len(self.moves))
+
+
+def replay_log(f):
+    """
+    Re-play a recorded game and check the recorded results.
+
+    Args:
+        f: (file) the log
+
+    Returns: (BitBoard) the board at the end of the game
+    """
+
+    header, moves, results = read_log(f)
+    return Replay(header, moves, results).run()
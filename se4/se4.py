@@ -3,6 +3,7 @@ Short Exercises #4
 Implement simplified version of battleship board
 """
 
+import json
 import random
 
 SIZE = 10
@@ -93,6 +94,32 @@ class Board:
         return ""        
         
     
+def parse_location(text, size=SIZE):
+    """
+    Convert a move into a (int, int) tuple
+    if possible.  Check in range(0, size).
+
+    Args:
+        text: (string) the move, as typed by the user
+        size: (int) the number of rows (and columns) in the board
+
+    Returns: (int, int) or None
+    """
+
+    split = text.split()
+    if len(split) != 2:
+        return None
+    try:
+        r = int(split[0])
+        c = int(split[1])
+    except (ValueError, IndexError):
+        return None
+
+    if 0 <= r < size and 0 <= c < size:
+        return r, c
+    return None
+
+
 class Game:
     """
     Represent the game
@@ -100,40 +127,46 @@ class Game:
     Attributes
     ----------
     board: (Board) the game board
+    size: (int) the number of rows (and columns) in the board (taken from
+        the board)
+    log: (file) where to record the game, or None
 
     Methods
     -------
     play(): play the game
     """
 
-    def __init__(self, ships):
-        self.board = Board()
-        self.board.deploy_fleet(ships)
-        
-    def __convert_input(self, keyboard):
+    def __init__(self, ships, board=None, log=None):
         """
-        Convert the input into a (int, int) tuple
-        if possible.  Check in range(0, SIZE).
+        Construct a game
 
         Args:
-            keyboard: (string) the user's input
-
-        Returns: (int, int) or None
+            ships: a dictionary that maps ships to starting locations
+            board: an empty board (for example, a bitboard.BitBoard with
+              its own size and ships).  Defaults to a new Board.
+            log: (file) if not None, the game is recorded in this file as
+              one JSON object per line (see replay.py): first the fleet
+              and the board, then each move and its result
         """
+        self.board = Board() if board is None else board
+        # Board always has SIZE rows and columns
+        self.size = getattr(self.board, "size", SIZE)
+        self.log = log
+        self.board.deploy_fleet(ships)
+        self.__record({"ships": ships, "size": self.size,
+                       "ship_sizes": getattr(self.board, "ship_sizes",
+                                             SHIP_SIZES)})
 
-        split = keyboard.split()
-        if len(split) != 2:
-            return None
-        try:
-            r = int(split[0])
-            c = int(split[1])
-        except (ValueError, IndexError):
-            return None
-
-        if 0 <= r < SIZE and 0 <= c < SIZE:
-            return r, c
-        return None
+    def __record(self, event):
+        """
+        Write an event to the log (if there is one).
 
+        Args:
+            event: (dict) the event
+        """
+        if self.log is not None:
+            self.log.write(json.dumps(event, separators=(",", ":")) + "\n")
+        
     def __get_input(self):
         """
         Keep asking for input until user enters: show, concede,
@@ -145,7 +178,7 @@ class Game:
             keyboard = input("Enter your move: ")
             if keyboard.lower() in ("concede", "cheat"):
                 return (keyboard.lower(), None)
-            result = self.__convert_input(keyboard)
+            result = parse_location(keyboard, self.size)
             if result:
                 return ("move", result)
             print("Please enter a valid board location or command...")
@@ -161,9 +194,12 @@ class Game:
         while not self.board.is_game_over():
             (action, loc) = self.__get_input()
             if action == "move":
-                print(self.board.play_move(loc))
+                result = self.board.play_move(loc)
+                self.__record({"move": loc, "result": result})
+                print(result)
                 num_shots = num_shots + 1
             elif action == "concede":
+                self.__record({"concede": num_shots})
                 print(f"You conceded after {num_shots} shots")
                 return
             elif action == "cheat":
@@ -174,33 +210,51 @@ class Game:
         print(f"You took {num_shots} shots to win")
 
 
-def generate_random_game():
+def generate_random_fleet(rng=random, size=SIZE, ship_sizes=SHIP_SIZES):
     """
-    Generate a game randomly:
-       Choose how many and which ships to include (zero to five)
+    Generate a fleet configuration randomly:
+       Choose how many and which ships to include (one to all of them)
        Choose where to place them on the board.
 
-    Returns: (Game) a randomly generated game
+    Args:
+        rng: (random.Random) source of random numbers (defaults to the
+          random module)
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+
+    Returns: (dict) a dictionary that maps ships to starting locations
     """
 
     # Choose how many and which ships to include
-    num_ships = random.randint(1, len(SHIP_SIZES))
-    ships = list(SHIP_SIZES.keys())
-    random.shuffle(ships)
+    num_ships = rng.randint(1, min(len(ship_sizes), size))
+    ships = list(ship_sizes.keys())
+    rng.shuffle(ships)
     ships = ships[:num_ships]
 
     # Choose which rows will hold ships
-    row_nums = list(range(SIZE))
-    random.shuffle(row_nums)
+    row_nums = list(range(size))
+    rng.shuffle(row_nums)
     rows_to_use = row_nums[:num_ships]
 
     config = {}
     for i, r in enumerate(rows_to_use):
         ship = ships[i]
-        c = random.randint(0, SIZE-SHIP_SIZES[ship])
+        c = rng.randint(0, size-ship_sizes[ship])
         config[ship] = (r, c)
-        
-    return Game(config)
+
+    return config
+
+
+def generate_random_game():
+    """
+    Generate a game randomly:
+       Choose how many and which ships to include (zero to five)
+       Choose where to place them on the board.
+
+    Returns: (Game) a randomly generated game
+    """
+
+    return Game(generate_random_fleet())
 
 if __name__ == "__main__":
     g = generate_random_game()
@@ -0,0 +1,150 @@
+"""
+Short Exercises #4 - Serve games over a socket
+
+Each connection plays its own game, against a fleet from
+fleets.random_fleet, using the same commands as Game.play, one per line:
+
+    r c         shoot at row r, column c
+    cheat       show the board
+    concede     give up
+
+The server replies to a move with its result ("Miss", "Hit", or the ship
+that was sunk) on one line, and to "cheat" with the board.  The
+connection is closed when the game ends.  All of the games are run in a
+single asyncio event loop.
+
+To run the server on TCP port 8888:
+    python3 server.py
+or on a Unix socket:
+    python3 server.py /tmp/battleship.sock
+"""
+
+import asyncio
+import random
+import sys
+
+from se4 import SIZE, SHIP_SIZES, parse_location
+from bitboard import BitBoard
+from fleets import random_fleet
+
+# The reply to a line that is not a command
+INVALID_COMMAND = "Please enter a valid board location or command...\n"
+
+
+class Session:
+    """
+    The state of one player's game
+
+    Attributes
+    ----------
+    board: (BitBoard) the game board
+    num_shots: (int) the number of moves played so far
+    """
+
+    __slots__ = ("board", "num_shots")
+
+    def __init__(self, fleet_locations, size=SIZE, ship_sizes=SHIP_SIZES):
+        self.board = BitBoard(size, ship_sizes)
+        self.board.deploy_fleet(fleet_locations)
+        self.num_shots = 0
+
+    def handle(self, line):
+        """
+        Carry out one command.
+
+        Args:
+            line: (string) the command
+
+        Returns: (string, bool) the reply and whether the game is over
+        """
+
+        command = line.strip().lower()
+        if command == "concede":
+            return f"You conceded after {self.num_shots} shots\n", True
+        if command == "cheat":
+            return str(self.board), False
+
+        loc = parse_location(command, self.board.size)
+        if loc is None:
+            return INVALID_COMMAND, False
+
+        result = self.board.play_move(loc)
+        self.num_shots += 1
+        if self.board.is_game_over():
+            return (f"{result}\nYou took {self.num_shots} shots to win\n",
+                    True)
+        return result + "\n", False
+
+
+async def play_session(reader, writer, rng, size=SIZE, ship_sizes=SHIP_SIZES):
+    """
+    Play a game over a connection.
+
+    Args:
+        reader: (asyncio.StreamReader) the commands from the player
+        writer: (asyncio.StreamWriter) where to send the replies
+        rng: (random.Random) source of random numbers for the fleet
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+    """
+
+    session = Session(random_fleet(rng, size=size, ship_sizes=ship_sizes),
+                      size, ship_sizes)
+    try:
+        writer.write(b"Ready to play?\n")
+        game_over = session.board.is_game_over()
+        while not game_over:
+            try:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode()
+            except ValueError:
+                # The line was too long for the reader, or was not UTF-8
+                reply = INVALID_COMMAND
+            else:
+                reply, game_over = session.handle(command)
+            writer.write(reply.encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host="127.0.0.1", port=8888, path=None, seed=None,
+                size=SIZE, ship_sizes=SHIP_SIZES):
+    """
+    Accept connections and play a game on each one, until cancelled.
+
+    Args:
+        host: (string) the address to listen on
+        port: (int) the TCP port to listen on
+        path: (string) if not None, listen on this Unix socket instead
+        seed: (int) seed for the random fleets (None for unpredictable)
+        size: (int) the number of rows (and columns) in each board
+        ship_sizes: (dict) maps each type of ship to its length
+    """
+
+    rng = random.Random(seed)
+
+    async def handle(reader, writer):
+        await play_session(reader, writer, rng, size, ship_sizes)
+
+    if path is None:
+        server = await asyncio.start_server(handle, host, port)
+    else:
+        server = await asyncio.start_unix_server(handle, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        asyncio.run(serve(path=sys.argv[1]))
+    else:
+        asyncio.run(serve())
@@ -0,0 +1,175 @@
+"""
+Short Exercises #4 - Headless simulation of battleship games
+
+A strategy is a generator function that takes a random.Random, the size of
+the board, and the ship sizes (as in SHIP_SIZES) and yields the locations
+to shoot at.  The result of each shot (as returned by play_move) is sent
+back into the generator, so
+
+    result = yield (row, col)
+
+gives the strategy "Miss", "Hit", or the name of the ship that was sunk.
+"""
+
+import collections
+import concurrent.futures
+import random
+
+from se4 import SIZE, SHIP_SIZES
+from bitboard import BitBoard
+from density import DensityShooter
+from fleets import random_fleet
+from tables import tables_for
+
+
+def all_locations(size):
+    """
+    Get every location on the board
+
+    Args:
+        size: (int) the number of rows (and columns) in the board
+
+    Returns: (list of (int, int)) the locations, in row-major order
+    """
+
+    return [(r, c) for r in range(size) for c in range(size)]
+
+
+def random_strategy(rng, size, ship_sizes):
+    """
+    Shoot at every location once, in a random order.
+    """
+
+    locations = all_locations(size)
+    rng.shuffle(locations)
+    for loc in locations:
+        yield loc
+
+
+def hunt_target_strategy(rng, size, ship_sizes):
+    """
+    Shoot at random locations (hunt) until there is a hit, and then at the
+    neighbors of the cells that were hit (target) until there are none
+    left to try.
+    """
+
+    neighbors = tables_for(size).neighbors
+    hunt_order = list(range(size * size))
+    rng.shuffle(hunt_order)
+    tried = set()
+    targets = []
+    while len(tried) < size * size:
+        while targets and targets[-1] in tried:
+            targets.pop()
+        if targets:
+            cell = targets.pop()
+        else:
+            cell = hunt_order.pop()
+            if cell in tried:
+                continue
+
+        tried.add(cell)
+        result = yield divmod(cell, size)
+        if result != "Miss":
+            targets.extend(i for i in neighbors[cell] if i not in tried)
+
+
+def density_strategy(rng, size, ship_sizes):
+    """
+    Shoot at the location covered by the most possible placements of the
+    ships that are afloat (see density.DensityShooter).
+    """
+
+    shooter = DensityShooter(size, ship_sizes)
+    loc = shooter.next_shot()
+    while loc is not None:
+        result = yield loc
+        shooter.record(loc, result)
+        loc = shooter.next_shot()
+
+
+def play_game(strategy, fleet_locations, rng, size=SIZE,
+              ship_sizes=SHIP_SIZES):
+    """
+    Play one game without any user interaction.
+
+    Args:
+        strategy: a strategy generator function (see the module docstring)
+        fleet_locations: (dict) maps ships to starting locations
+        rng: (random.Random) source of random numbers for the strategy
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+
+    Returns: (int) the number of shots needed to sink every ship
+    """
+
+    board = BitBoard(size, ship_sizes)
+    board.deploy_fleet(fleet_locations)
+
+    num_shots = 0
+    shooter = strategy(rng, size, ship_sizes)
+    result = None
+    while not board.is_game_over():
+        loc = shooter.send(result)
+        result = board.play_move(loc)
+        num_shots = num_shots + 1
+    shooter.close()
+    return num_shots
+
+
+def _simulate_range(strategy, first_game, num_games, seed, size, ship_sizes,
+                    fleet_generator):
+    """
+    Play games number first_game to first_game + num_games - 1 (runs in
+    a worker).  Each game has its own random number generator, seeded by
+    seed and the game number, so the results do not depend on how the
+    games are divided between workers.
+    """
+
+    shots = collections.Counter()
+    for game in range(first_game, first_game + num_games):
+        rng = random.Random(f"{seed}-{game}")
+        fleet_locations = fleet_generator(rng, size=size,
+                                          ship_sizes=ship_sizes)
+        shots[play_game(strategy, fleet_locations, rng, size, ship_sizes)] += 1
+    return shots
+
+
+def simulate_games(strategy, num_games, seed=0, num_workers=1, size=SIZE,
+                   ship_sizes=SHIP_SIZES, fleet_generator=random_fleet):
+    """
+    Play games with randomly generated fleets against a strategy and
+    collect the number of shots each one took.
+
+    Args:
+        strategy: a strategy generator function (see the module docstring)
+        num_games: (int) the number of games to play
+        seed: (int) seed for the random fleets and strategy choices
+        num_workers: (int) the number of processes to use
+        size: (int) the number of rows (and columns) in the board
+        ship_sizes: (dict) maps each type of ship to its length
+        fleet_generator: a function that takes a random.Random and the
+          size and ship_sizes keyword arguments and returns fleet
+          locations (fleets.random_fleet, which places every ship anywhere
+          on the board, or se4.generate_random_fleet, which puts some of
+          the ships in rows of their own)
+
+    Returns: (dict) maps a number of shots to the number of games that
+        took that many shots, sorted by the number of shots
+    """
+
+    if num_workers <= 1:
+        shots = _simulate_range(strategy, 0, num_games, seed, size,
+                                ship_sizes, fleet_generator)
+    else:
+        per_worker = -(-num_games // num_workers)
+        shots = collections.Counter()
+        with concurrent.futures.ProcessPoolExecutor(num_workers) as pool:
+            futures = [pool.submit(_simulate_range, strategy, first,
+                                   min(per_worker, num_games - first), seed,
+                                   size, ship_sizes, fleet_generator)
+                       for first in range(0, num_games, per_worker)]
+            for future in futures:
+                shots.update(future.result())
+
+    return dict(sorted(shots.items()))
@@ -0,0 +1,140 @@
+"""
+Short Exercises #4 - Precomputed tables for boards of a given size
+
+Cell (row, col) of a board with size rows and columns is numbered
+row * size + col, and sets of cells are stored as integers (bitsets)
+with one bit per cell.  The tables for each size are computed the first
+time they are needed and shared by every board of that size.
+"""
+
+from se4 import SIZE
+
+# Maps a board size to its BoardTables, filled in by tables_for()
+_TABLES = {}
+
+
+def tables_for(size=SIZE):
+    """
+    Get the tables for boards of a given size (computed once per size)
+
+    Args:
+        size: (int) the number of rows (and columns) in the board
+
+    Returns: (BoardTables) the tables
+    """
+
+    if size not in _TABLES:
+        _TABLES[size] = BoardTables(size)
+    return _TABLES[size]
+
+
+class BoardTables:
+    """
+    Tables for boards of one size
+
+    Attributes
+    ----------
+    size: (int) the number of rows (and columns) in the board
+    num_cells: (int) the number of cells in the board
+    cell_numbers: (dict) maps each location (row, col) in the board to its
+        cell number
+    cell_bits: (list of ints) the bit for each cell number
+    row_masks: (list of ints) the bitset of the cells in each row
+    neighbors: (list of tuples of ints) the cells above, below, left, and
+        right of each cell (those that are in the board)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.num_cells = size * size
+        self.cell_numbers = {(r, c): r * size + c
+                             for r in range(size) for c in range(size)}
+        self.cell_bits = [1 << i for i in range(self.num_cells)]
+        self.row_masks = [((1 << size) - 1) << (r * size) for r in range(size)]
+        self.neighbors = []
+        for r in range(size):
+            for c in range(size):
+                self.neighbors.append(tuple(
+                    nr * size + nc
+                    for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                    if 0 <= nr < size and 0 <= nc < size))
+
+        # Maps a ship length to its placement tables, filled in by
+        # placements()
+        self._placements = {}
+
+    def ship_cell_numbers(self, length, location):
+        """
+        Get the cells covered by a ship
+
+        Args:
+            length: (int) the length of the ship
+            location: (row, col) of the leftmost cell of a horizontal ship,
+              or (row, col, vertical), where vertical (bool) says whether
+              (row, col) is instead the top cell of a vertical ship
+
+        Returns: (range) the number of each cell
+
+        Raises: ValueError if the ship does not fit on the board there
+        """
+
+        row, col = location[0], location[1]
+        vertical = len(location) > 2 and location[2]
+        if vertical:
+            fits = 0 <= row <= self.size - length and 0 <= col < self.size
+            step = self.size
+        else:
+            fits = 0 <= row < self.size and 0 <= col <= self.size - length
+            step = 1
+        if not fits:
+            raise ValueError(f"A ship of length {length} at {location} does "
+                             "not fit on the board")
+        first = row * self.size + col
+        return range(first, first + length * step, step)
+
+    def placements(self, length):
+        """
+        Get every legal placement of a ship on an empty board (computed
+        once per ship length)
+
+        Args:
+            length: (int) the length of the ship
+
+        Returns: (Placements) the placements
+        """
+
+        if length not in self._placements:
+            self._placements[length] = Placements(self, length)
+        return self._placements[length]
+
+
+class Placements:
+    """
+    The legal placements of a ship of one length on an empty board
+
+    Attributes
+    ----------
+    locations: (list of (int, int, bool)) (row, col, vertical) of each
+        placement
+    cells: (list of ranges) the cells covered by each placement
+    masks: (list of ints) the bitset of the cells covered by each placement
+    covering: (list of lists of ints) for each cell, the indexes of the
+        placements that cover it
+    """
+
+    def __init__(self, tables, length):
+        size = tables.size
+        self.locations = [(r, c, False)
+                          for r in range(size) for c in range(size - length + 1)]
+        self.locations += [(r, c, True)
+                           for r in range(size - length + 1) for c in range(size)]
+        self.cells = [tables.ship_cell_numbers(length, loc)
+                      for loc in self.locations]
+        self.masks = [sum(1 << i for i in cells) for cells in self.cells]
+        self.covering = [[] for _ in range(tables.num_cells)]
+        for p, cells in enumerate(self.cells):
+            for i in cells:
+                self.covering[i].append(p)
+
+    def __len__(self):
+        return len(self.locations)
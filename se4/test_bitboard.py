@@ -0,0 +1,266 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+from bitboard import BitBoard
+
+FLEET_NAMES = ["full_fleet", "one_ship", "two_ships_same_row",
+               "two_adjacent_ships", "no_ships"]
+NUM_MOVE_TESTS = 9
+
+
+def load_config(name):
+    '''
+    Load a test configuration from the tests directory.
+    '''
+
+    with open(f"tests/{name}.json") as f:
+        return json.load(f)
+
+
+def board_with_fleet(config):
+    board = BitBoard()
+    board.deploy_fleet(config["ships"])
+    return board
+
+
+def board_str(grid):
+    '''
+    The expected string representation of a list-of-lists board.
+    '''
+
+    return "".join(" ".join(cell[0] for cell in row) + "\n" for row in grid)
+
+
+@pytest.mark.parametrize("fleet_name", FLEET_NAMES)
+def test_deploy_fleet(fleet_name):
+    config = load_config(fleet_name)
+    board = board_with_fleet(config)
+
+    assert board.board == config["board"]
+    assert str(board) == config["str"]
+    assert board.is_game_over() == config["is_over"]
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_play_move(test_num):
+    config = load_config(f"moves_{test_num}")
+    board = board_with_fleet(config)
+
+    results = [board.play_move(loc) for loc in config["moves"]]
+    assert results == config["expected_results"]
+    assert board.board == config["final_board"]
+    assert board.num_ships == config["num_ships"]
+    assert str(board) == board_str(config["final_board"])
+
+
+def test_remaining_counts():
+    board = board_with_fleet(load_config("full_fleet"))
+    assert board.remaining == {"Carrier": 5, "Battleship": 4, "Destroyer": 3,
+                               "Submarine": 3, "Patrol Boat": 2}
+    assert board.cell_ships[4] == "Carrier"
+    assert board.cell_ships[0] is None
+
+    for loc in [(0, 4), (0, 5), (0, 5), (2, 2)]:
+        board.play_move(loc)
+    assert board.remaining["Carrier"] == 3
+    assert board.num_ships == 5
+
+    assert [board.play_move((9, c)) for c in (8, 9)] == ["Hit", "Patrol Boat"]
+    assert board.remaining["Patrol Boat"] == 0
+    assert board.num_ships == 4
+
+
+OVERLAPPING_FLEETS = [{"Carrier": (0, 0), "Battleship": (0, 1)},
+                      {"Carrier": (0, 2), "Battleship": (0, 3, True)},
+                      {"Carrier": (2, 0), "Patrol Boat": (1, 4, True)}]
+
+
+@pytest.mark.parametrize("fleet", OVERLAPPING_FLEETS)
+def test_deploy_fleet_overlap(fleet):
+    board = BitBoard()
+    with pytest.raises(ValueError):
+        board.deploy_fleet(fleet)
+    assert board.num_ships == 0
+    assert board.cell_ships == [None] * 100
+    assert board.remaining == {}
+
+
+def test_deploy_fleet_twice():
+    board = BitBoard()
+    board.deploy_fleet({"Carrier": (0, 0)})
+    for fleet in [{"Carrier": (5, 0)},
+                  {"Destroyer": (9, 0), "Carrier": (5, 0)},
+                  {"Destroyer": (0, 4, True)}]:
+        with pytest.raises(ValueError):
+            board.deploy_fleet(fleet)
+
+    assert board.num_ships == 1
+    assert board.ship_cells == {"Carrier": 0b11111}
+    assert board.cell_ships.count("Carrier") == 5
+    assert board.cell_ships.count(None) == 95
+
+    board.deploy_fleet({"Destroyer": (1, 4, True)})
+    for c in range(5):
+        board.play_move((0, c))
+    for r in range(1, 4):
+        board.play_move((r, 4))
+    assert board.is_game_over()
+
+
+@pytest.mark.parametrize("fleet_name", FLEET_NAMES)
+def test_render_styles(fleet_name):
+    config = load_config(fleet_name)
+    board = board_with_fleet(config)
+
+    assert board.render() == config["str"]
+    assert board.render("compact") == config["str"].replace(" ", "")
+    color = board.render("color")
+    for code in ("\033[34m", "\033[31m", "\033[0m"):
+        color = color.replace(code, "")
+    assert color == config["str"]
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_render_after_moves(test_num):
+    config = load_config(f"moves_{test_num}")
+    board = board_with_fleet(config)
+    board.render()
+    board.render("compact")
+
+    for loc in config["moves"]:
+        board.play_move(loc)
+    expected = board_str(config["final_board"])
+    assert board.render() == expected
+    assert board.render("compact") == expected.replace(" ", "")
+
+
+def test_render_cache_is_lazy():
+    board = board_with_fleet(load_config("full_fleet"))
+    assert board.row_cache == {}
+    board.render("compact")
+    assert list(board.row_cache) == ["compact"]
+
+
+def test_render_unknown_style():
+    with pytest.raises(ValueError):
+        BitBoard().render("fancy")
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_play_moves(test_num):
+    config = load_config(f"moves_{test_num}")
+    board = board_with_fleet(config)
+
+    codes = board.play_moves(config["moves"])
+    assert isinstance(codes, bytearray)
+    assert [board.results[code] for code in codes] == \
+        config["expected_results"]
+    assert board.board == config["final_board"]
+    assert board.num_ships == config["num_ships"]
+
+
+def test_play_moves_in_parts():
+    config = load_config("moves_2")
+    board = board_with_fleet(config)
+    moves = [tuple(loc) for loc in config["moves"]]
+
+    codes = board.play_moves(moves[:3]) + board.play_moves(moves[3:])
+    assert [board.results[code] for code in codes] == \
+        config["expected_results"]
+
+
+def test_play_moves_repeated_shots():
+    board = board_with_fleet(load_config("one_ship"))
+    codes = board.play_moves([(4, 4), (4, 4), (0, 0), (0, 0), (4, 4)])
+    assert [board.results[code] for code in codes] == \
+        ["Hit", "Miss", "Miss", "Miss", "Miss"]
+    assert board.remaining["Carrier"] == 4
+
+
+@pytest.mark.parametrize("locs", [[(0, 0), (10, 0)],
+                                  [(0, 0), (0, -1)],
+                                  [(0, 0), (1,)],
+                                  [(0, 0), (1, 2, 3)],
+                                  [(0, 0), 5],
+                                  [(0, 0), "ab"]])
+def test_play_moves_bad_location(locs):
+    board = board_with_fleet(load_config("one_ship"))
+    with pytest.raises(ValueError):
+        board.play_moves(locs)
+    assert board.shots == 0
+
+
+@pytest.mark.parametrize("loc", [(10, 0), (0, 10), (-1, 0)])
+def test_play_move_bad_location(loc):
+    with pytest.raises(ValueError):
+        BitBoard().play_move(loc)
+
+
+@pytest.mark.parametrize("location", [(0, 8), (8, 0, True), (-1, 0), (0, 10)])
+def test_deploy_fleet_does_not_fit(location):
+    board = BitBoard()
+    with pytest.raises(ValueError):
+        board.deploy_fleet({"Patrol Boat": (0, 0), "Carrier": location})
+    assert board.num_ships == 0
+    assert board.cell_ships == [None] * 100
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_snapshot_restore(test_num):
+    config = load_config(f"moves_{test_num}")
+    board = board_with_fleet(config)
+    half = len(config["moves"]) // 2
+    for loc in config["moves"][:half]:
+        board.play_move(loc)
+    snapshot = board.snapshot()
+    grid = board.board
+    text = str(board)
+
+    for loc in config["moves"][half:]:
+        board.play_move(loc)
+    board.restore(snapshot)
+    assert board.board == grid
+    assert str(board) == text
+
+    results = [board.play_move(loc) for loc in config["moves"][half:]]
+    assert results == config["expected_results"][half:]
+    assert board.board == config["final_board"]
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_clone(test_num):
+    config = load_config(f"moves_{test_num}")
+    board = board_with_fleet(config)
+    half = len(config["moves"]) // 2
+    for loc in config["moves"][:half]:
+        board.play_move(loc)
+    grid = board.board
+    text = board.render("compact")
+
+    clone = board.clone()
+    results = [clone.play_move(loc) for loc in config["moves"][half:]]
+    assert results == config["expected_results"][half:]
+    assert clone.board == config["final_board"]
+    assert clone.num_ships == config["num_ships"]
+
+    assert board.board == grid
+    assert board.render("compact") == text
+    assert clone.cell_ships is board.cell_ships
+
+
+def test_clone_deploy_fleet():
+    board = BitBoard()
+    clone = board.clone()
+    clone.deploy_fleet({"Carrier": (0, 0)})
+
+    assert clone.num_ships == 1
+    assert board.num_ships == 0
+    assert board.cell_ships == [None] * 100
+    assert board.ship_cells == {}
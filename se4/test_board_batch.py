@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+from board_batch import BoardBatch
+
+NUM_MOVE_TESTS = 9
+
+
+def load_config(name):
+    '''
+    Load a test configuration from the tests directory.
+    '''
+
+    with open(f"tests/{name}.json") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("test_num", range(NUM_MOVE_TESTS))
+def test_play_moves(test_num):
+    config = load_config(f"moves_{test_num}")
+    batch = BoardBatch.from_fleets([config["ships"]] * 3)
+
+    for loc, expected in zip(config["moves"], config["expected_results"]):
+        codes = batch.play_moves([loc] * 3)
+        assert [batch.results[code] for code in codes] == [expected] * 3
+
+    for i in range(3):
+        assert batch.board(i) == config["final_board"]
+    assert batch.num_ships().tolist() == [config["num_ships"]] * 3
+    assert batch.is_game_over().tolist() == [config["num_ships"] == 0] * 3
+
+
+def test_play_moves_different_boards():
+    # Every board gets its own moves.  Boards that run out of moves shoot
+    # at their last move again, which is always a miss.
+    configs = [load_config(f"moves_{test_num}")
+               for test_num in range(NUM_MOVE_TESTS)]
+    configs = [config for config in configs if config["moves"]]
+    batch = BoardBatch.from_fleets([config["ships"] for config in configs])
+
+    num_moves = max(len(config["moves"]) for config in configs)
+    for step in range(num_moves):
+        locs = [config["moves"][min(step, len(config["moves"]) - 1)]
+                for config in configs]
+        codes = batch.play_moves(np.array(locs))
+        for config, code in zip(configs, codes):
+            expected = config["expected_results"][step] \
+                if step < len(config["moves"]) else "Miss"
+            assert batch.results[code] == expected
+
+    for i, config in enumerate(configs):
+        assert batch.board(i) == config["final_board"]
+
+
+@pytest.mark.parametrize("locs", [[(0, 0)], [(0, 0), (0, 0), (0, 0)],
+                                  [(0, 0), (10, 0)], [(0, 0), (0, -1)]])
+def test_play_moves_bad_locations(locs):
+    batch = BoardBatch.from_fleets([load_config("one_ship")["ships"]] * 2)
+    with pytest.raises(ValueError):
+        batch.play_moves(locs)
+
+
+BAD_FLEETS = [{"Carrier": (0, 0), "Battleship": (0, 1)},
+              {"Patrol Boat": (0, 0), "Carrier": (0, 8)},
+              {"Patrol Boat": (0, 0), "Carrier": (9, 0, True)},
+              {"Patrol Boat": (0, 0), "Submarine": (5, 4)}]
+
+
+@pytest.mark.parametrize("fleet", BAD_FLEETS)
+def test_deploy_fleet_rejected(fleet):
+    batch = BoardBatch.from_fleets([{"Destroyer": (5, 5)}] * 2)
+    for i in range(2):
+        with pytest.raises(ValueError):
+            batch.deploy_fleet(i, fleet)
+
+    assert batch.num_ships().tolist() == [1, 1]
+    for i in range(2):
+        assert np.count_nonzero(batch.cells[i]) == 3
+        assert np.count_nonzero(batch.remaining[i]) == 1
+
+
+def test_deploy_fleet_twice():
+    batch = BoardBatch(1)
+    batch.deploy_fleet(0, {"Carrier": (0, 0)})
+    for fleet in [{"Carrier": (5, 0)}, {"Destroyer": (0, 2, True)}]:
+        with pytest.raises(ValueError):
+            batch.deploy_fleet(0, fleet)
+
+    assert batch.num_ships().tolist() == [1]
+    for c in range(5):
+        batch.play_moves([(0, c)])
+    assert batch.is_game_over().tolist() == [True]
+
+
+def test_too_many_ships():
+    with pytest.raises(ValueError):
+        BoardBatch(1, ship_sizes={str(i): 1 for i in range(255)})
@@ -0,0 +1,112 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import se4
+from se4 import SHIP_SIZES
+from bitboard import BitBoard
+from density import DensityShooter
+from fleets import random_fleet
+from tables import tables_for
+
+
+def recount_density(shooter, board, afloat):
+    '''
+    Count, for every cell, the placements of the ships that are afloat
+    that do not cover a miss or the cells of a sunk ship.
+    '''
+
+    size = shooter.size
+    blocked = set()
+    for i in range(size * size):
+        if shooter.shot[i]:
+            if board.cell_ships[i] is None or i not in shooter.hits:
+                blocked.add(i)
+
+    density = [0] * (size * size)
+    for length, num in afloat.items():
+        for r in range(size):
+            for c in range(size):
+                for vertical in (False, True):
+                    if vertical:
+                        cells = [(r + k) * size + c for k in range(length)]
+                        fits = r + length <= size
+                    else:
+                        cells = [r * size + c + k for k in range(length)]
+                        fits = c + length <= size
+                    if fits and not blocked.intersection(cells):
+                        for i in cells:
+                            density[i] += num
+    return density
+
+
+@pytest.mark.parametrize("size, ship_sizes",
+                         [(10, SHIP_SIZES),
+                          (6, {"A": 3, "B": 3, "C": 2}),
+                          (8, {"A": 1, "B": 4})])
+@pytest.mark.parametrize("seed", range(3))
+def test_density(size, ship_sizes, seed):
+    rng = random.Random(seed)
+    board = BitBoard(size, ship_sizes)
+    board.deploy_fleet(random_fleet(rng, size=size, ship_sizes=ship_sizes))
+    shooter = DensityShooter(size, ship_sizes)
+    afloat = {}
+    for length in ship_sizes.values():
+        afloat[length] = afloat.get(length, 0) + 1
+    assert shooter.density == recount_density(shooter, board, afloat)
+
+    while not board.is_game_over():
+        loc = shooter.next_shot()
+        assert not shooter.shot[loc[0] * size + loc[1]]
+        result = board.play_move(loc)
+        shooter.record(loc, result)
+        if result in ship_sizes:
+            afloat[ship_sizes[result]] -= 1
+        assert shooter.density == recount_density(shooter, board, afloat)
+
+
+def test_next_shot_when_every_cell_is_shot():
+    shooter = DensityShooter(2, {"A": 1})
+    for loc in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+        shooter.record(loc, "Miss")
+    assert shooter.next_shot() is None
+
+
+def test_placements():
+    tables = tables_for(5)
+    placements = tables.placements(3)
+    assert len(placements) == 2 * 5 * 3
+    assert tables.placements(3) is placements
+    for p, location in enumerate(placements.locations):
+        cells = tables.ship_cell_numbers(3, location)
+        assert list(placements.cells[p]) == list(cells)
+        assert placements.masks[p] == sum(1 << i for i in cells)
+        for i in cells:
+            assert p in placements.covering[i]
+
+
+def test_neighbors():
+    tables = tables_for(3)
+    assert sorted(tables.neighbors[0]) == [1, 3]
+    assert sorted(tables.neighbors[4]) == [1, 3, 5, 7]
+    assert sorted(tables.neighbors[8]) == [5, 7]
+
+
+def test_game_size_from_board(monkeypatch, capsys):
+    moves = iter(["0 15", "19 19", "concede"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(moves))
+
+    board = BitBoard(20, {"Patrol Boat": 2})
+    game = se4.Game({"Patrol Boat": (0, 15)}, board)
+    assert game.size == 20
+    game.play()
+
+    out = capsys.readouterr().out
+    assert out.split("\n")[1:3] == ["Hit", "Miss"]
+    assert "You conceded after 2 shots" in out
@@ -0,0 +1,79 @@
+import collections
+import os
+import random
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+from se4 import SHIP_SIZES
+from bitboard import BitBoard
+from fleets import generate_fleets, random_fleet
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_fleet(seed):
+    fleet = random_fleet(random.Random(seed))
+    assert sorted(fleet) == sorted(SHIP_SIZES)
+
+    board = BitBoard()
+    board.deploy_fleet(fleet)
+    assert board.num_ships == len(SHIP_SIZES)
+    assert sum(board.remaining.values()) == sum(SHIP_SIZES.values())
+
+
+def test_random_fleet_some_ships():
+    fleet = random_fleet(random.Random(0), ["Carrier", "Patrol Boat"])
+    assert sorted(fleet) == ["Carrier", "Patrol Boat"]
+
+
+def test_generate_fleets():
+    fleets = generate_fleets(10, seed=7)
+    assert len(fleets) == 10
+    assert generate_fleets(10, seed=7) == fleets
+    assert generate_fleets(10, seed=8) != fleets
+
+
+@pytest.mark.parametrize("size, ship_sizes",
+                         [(4, {"Carrier": 5}),
+                          (2, {"A": 2, "B": 2, "C": 1}),
+                          (3, {"A": 3, "B": 3, "C": 2, "D": 2}),
+                          (6, {str(i): 4 for i in range(9)}),
+                          (10, {str(i): 4 for i in range(25)})])
+def test_random_fleet_does_not_fit(size, ship_sizes):
+    with pytest.raises(ValueError):
+        random_fleet(random.Random(0), size=size, ship_sizes=ship_sizes)
+
+
+@pytest.mark.parametrize("size, ship_sizes",
+                         [(3, {"A": 3, "B": 3, "C": 3}),
+                          (10, {str(i): 3 for i in range(20)}),
+                          (10, {str(i): 2 for i in range(50)}),
+                          (8, {str(i): 5 for i in range(12)})])
+def test_random_fleet_crowded(size, ship_sizes):
+    # Too crowded for redrawing the fleet until no ships overlap
+    fleet = random_fleet(random.Random(0), size=size, ship_sizes=ship_sizes)
+    assert sorted(fleet) == sorted(ship_sizes)
+
+    board = BitBoard(size, ship_sizes)
+    board.deploy_fleet(fleet)
+    assert board.num_ships == len(ship_sizes)
+    assert size * size - board.cell_ships.count(None) == \
+        sum(ship_sizes.values())
+
+
+def test_random_fleet_is_uniform():
+    # Two ships of length 1 on a 2 x 2 board can be placed in 4 * 3 ways,
+    # and each one should come up about 1 / 12 of the time.
+    ship_sizes = {"A": 1, "B": 1}
+    rng = random.Random(9)
+    counts = collections.Counter()
+    for _ in range(12000):
+        fleet = random_fleet(rng, size=2, ship_sizes=ship_sizes)
+        counts[fleet["A"][:2], fleet["B"][:2]] += 1
+
+    assert len(counts) == 12
+    assert all(850 <= count <= 1150 for count in counts.values())
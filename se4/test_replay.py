@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+import se4
+from bitboard import BitBoard
+from fleets import random_fleet
+from replay import Replay, read_log, replay_log, write_log
+
+
+def random_game(seed, size=10, ship_sizes=se4.SHIP_SIZES):
+    '''
+    Play every location on the board in a random order.
+    '''
+
+    rng = random.Random(seed)
+    ships = random_fleet(rng, size=size, ship_sizes=ship_sizes)
+    board = BitBoard(size, ship_sizes)
+    board.deploy_fleet(ships)
+    moves = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(moves)
+    results = [board.play_move(loc) for loc in moves]
+    return ships, moves, results
+
+
+def board_after(ships, moves, k, size=10, ship_sizes=se4.SHIP_SIZES):
+    board = BitBoard(size, ship_sizes)
+    board.deploy_fleet(ships)
+    for loc in moves[:k]:
+        board.play_move(loc)
+    return board
+
+
+def test_write_read_log():
+    ships, moves, results = random_game(0)
+    f = io.StringIO()
+    write_log(f, ships, moves, results)
+    f.seek(0)
+
+    header, logged_moves, logged_results = read_log(f)
+    assert header["size"] == 10
+    assert header["ship_sizes"] == se4.SHIP_SIZES
+    assert {ship: tuple(loc) for ship, loc in header["ships"].items()} == \
+        ships
+    assert logged_moves == moves
+    assert logged_results == results
+
+
+@pytest.mark.parametrize("checkpoint_every", [1, 7, 64, 200])
+def test_seek(checkpoint_every):
+    ships, moves, results = random_game(1)
+    header = {"ships": ships, "size": 10, "ship_sizes": se4.SHIP_SIZES}
+    replay = Replay(header, moves, results, checkpoint_every)
+
+    for k in [50, 3, 99, 0, 64, 100, 20]:
+        board = replay.seek(k)
+        assert replay.position == k
+        expected = board_after(ships, moves, k)
+        assert board.board == expected.board
+        assert str(board) == str(expected)
+        assert board.num_ships == expected.num_ships
+
+
+def test_replay_log_small_board():
+    ship_sizes = {"Destroyer": 3, "Patrol Boat": 2}
+    ships, moves, results = random_game(2, 5, ship_sizes)
+    f = io.StringIO()
+    write_log(f, ships, moves, results, 5, ship_sizes)
+    f.seek(0)
+
+    board = replay_log(f)
+    assert board.board == board_after(ships, moves, 25, 5, ship_sizes).board
+
+
+def test_replay_mismatch():
+    ships, moves, results = random_game(3)
+    i = results.index("Miss")
+    results[i] = "Hit"
+    header = {"ships": ships, "size": 10}
+    replay = Replay(header, moves, results)
+
+    replay.seek(i)
+    expected = str(replay.board)
+    with pytest.raises(ValueError):
+        replay.step()
+    assert replay.position == i
+    assert str(replay.board) == expected
+
+
+def test_replay_mismatch_on_hit():
+    # Shooting the cell again after the mismatch would give the "Miss"
+    # that the log has.
+    header = {"ships": {"Patrol Boat": (0, 0)}, "size": 10,
+              "ship_sizes": {"Patrol Boat": 2}}
+    replay = Replay(header, [(0, 0), (0, 1)], ["Miss", "Patrol Boat"])
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            replay.step()
+        assert replay.position == 0
+        assert replay.board.remaining["Patrol Boat"] == 2
+        assert replay.board.shots == 0
+    with pytest.raises(ValueError):
+        replay.run()
+
+
+@pytest.mark.parametrize("k", [-1, 101])
+def test_seek_out_of_range(k):
+    ships, moves, results = random_game(4)
+    replay = Replay({"ships": ships}, moves, results)
+    with pytest.raises(ValueError):
+        replay.seek(k)
+    assert replay.position == 0
+
+
+@pytest.mark.parametrize("checkpoint_every", [0, -1])
+def test_bad_checkpoint_every(checkpoint_every):
+    ships, moves, results = random_game(5)
+    with pytest.raises(ValueError):
+        Replay({"ships": ships}, moves, results, checkpoint_every)
+
+
+def test_replay_game_log(monkeypatch, capsys):
+    ship_sizes = {"Destroyer": 3, "Patrol Boat": 2}
+    ships = {"Destroyer": (1, 1, True), "Patrol Boat": (4, 3)}
+    moves = ["1 1", "0 0", "2 1", "3 1", "cheat", "4 3", "4 4"]
+    inputs = iter(moves)
+    monkeypatch.setattr("builtins.input", lambda prompt: next(inputs))
+
+    f = io.StringIO()
+    game = se4.Game(ships, BitBoard(5, ship_sizes), f)
+    game.play()
+    capsys.readouterr()
+
+    f.seek(0)
+    assert json.loads(f.readline())["ship_sizes"] == ship_sizes
+    f.seek(0)
+    board = replay_log(f)
+    assert board.is_game_over()
+    assert str(board) == str(game.board)
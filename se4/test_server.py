@@ -0,0 +1,88 @@
+import asyncio
+import os
+import random
+import socket
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+from se4 import SHIP_SIZES
+from fleets import random_fleet
+from server import INVALID_COMMAND, Session, play_session
+
+FLEET = {"Carrier": (0, 0), "Patrol Boat": (2, 2, True)}
+FLEET_SIZES = {"Carrier": 5, "Patrol Boat": 2}
+
+
+def test_session():
+    session = Session(FLEET, 10, FLEET_SIZES)
+    assert session.handle("0 0\n") == ("Hit\n", False)
+    assert session.handle("9 9") == ("Miss\n", False)
+    assert session.handle("ten 0\n") == (INVALID_COMMAND, False)
+    assert session.handle("0 10\n") == (INVALID_COMMAND, False)
+    assert session.handle("CHEAT\n") == (str(session.board), False)
+    assert session.handle("2 2\n") == ("Hit\n", False)
+    assert session.handle("3 2\n") == ("Patrol Boat\n", False)
+    assert session.num_shots == 4
+
+    for c in range(1, 4):
+        assert session.handle(f"0 {c}\n") == ("Hit\n", False)
+    reply, game_over = session.handle("0 4\n")
+    assert reply == "Carrier\nYou took 8 shots to win\n"
+    assert game_over
+
+
+def test_session_concede():
+    session = Session(FLEET, 10, FLEET_SIZES)
+    session.handle("5 5")
+    assert session.handle("concede\n") == \
+        ("You conceded after 1 shots\n", True)
+
+
+async def converse(lines, seed, ship_sizes):
+    '''
+    Play a session over a socket pair, sending each of the lines in turn
+    and reading every reply until the server closes the connection.
+    '''
+
+    server_sock, client_sock = socket.socketpair()
+    server_reader, server_writer = await asyncio.open_connection(
+        sock=server_sock, limit=64)
+    server = asyncio.create_task(
+        play_session(server_reader, server_writer, random.Random(seed), 10,
+                     ship_sizes))
+
+    reader, writer = await asyncio.open_connection(sock=client_sock)
+    for line in lines:
+        writer.write(line)
+    await writer.drain()
+    output = await reader.read()
+    writer.close()
+    await server
+    return output
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_play_session(seed):
+    ship_sizes = {"Patrol Boat": 2}
+    fleet = random_fleet(random.Random(seed), size=10, ship_sizes=ship_sizes)
+    row, col = fleet["Patrol Boat"][:2]
+    if len(fleet["Patrol Boat"]) > 2 and fleet["Patrol Boat"][2]:
+        second = (row + 1, col)
+    else:
+        second = (row, col + 1)
+
+    lines = [b"\xff\xfe\n", b"9" * 100 + b"\n", b"bad\n",
+             f"{row} {col}\n".encode(), f"{second[0]} {second[1]}\n".encode()]
+    output = asyncio.run(converse(lines, seed, ship_sizes)).decode()
+    assert output == ("Ready to play?\n" + INVALID_COMMAND * 3 +
+                      "Hit\nPatrol Boat\nYou took 2 shots to win\n")
+
+
+def test_play_session_concede():
+    output = asyncio.run(converse([b"concede\n"], 0, SHIP_SIZES)).decode()
+    assert output == "Ready to play?\nYou conceded after 0 shots\n"
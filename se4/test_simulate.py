@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Handle the fact that the test code may not
+# be in the same directory as the solution code
+sys.path.insert(0, os.getcwd())
+
+from se4 import SHIP_SIZES, generate_random_fleet
+from simulate import (all_locations, density_strategy, hunt_target_strategy,
+                      play_game, random_strategy, simulate_games)
+
+STRATEGIES = [random_strategy, hunt_target_strategy, density_strategy]
+FLEET = {"Carrier": (0, 0), "Battleship": (2, 2, True),
+         "Destroyer": (9, 7), "Submarine": (5, 9, True),
+         "Patrol Boat": (7, 0)}
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_strategy_shoots_each_location_once(strategy):
+    shooter = strategy(random.Random(1), 10, SHIP_SIZES)
+    locations = [shooter.send(None)]
+    while len(locations) < 100:
+        locations.append(shooter.send("Miss"))
+    with pytest.raises(StopIteration):
+        shooter.send("Miss")
+    assert sorted(locations) == all_locations(10)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_play_game(strategy):
+    num_shots = play_game(strategy, FLEET, random.Random(2))
+    assert 17 <= num_shots <= 100
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_simulate_games(strategy):
+    shots = simulate_games(strategy, 40, seed=3)
+    assert sum(shots.values()) == 40
+    assert list(shots) == sorted(shots)
+    assert all(17 <= num_shots <= 100 for num_shots in shots)
+
+
+@pytest.mark.parametrize("num_workers", [2, 3])
+def test_simulate_games_workers(num_workers):
+    expected = simulate_games(hunt_target_strategy, 25, seed=4)
+    assert simulate_games(hunt_target_strategy, 25, seed=4,
+                          num_workers=num_workers) == expected
+
+
+def test_simulate_games_small_board():
+    ship_sizes = {"Destroyer": 3, "Patrol Boat": 2}
+    shots = simulate_games(density_strategy, 20, seed=5, size=4,
+                           ship_sizes=ship_sizes)
+    assert sum(shots.values()) == 20
+    assert all(5 <= num_shots <= 16 for num_shots in shots)
+
+
+def test_simulate_games_fleet_generator():
+    shots = simulate_games(random_strategy, 20, seed=6,
+                           fleet_generator=generate_random_fleet)
+    assert sum(shots.values()) == 20